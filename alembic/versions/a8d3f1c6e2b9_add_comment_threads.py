@@ -0,0 +1,55 @@
+"""add comment threads
+
+Revision ID: a8d3f1c6e2b9
+Revises: f2c4a8e6b0d7
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3f1c6e2b9'
+down_revision: Union[str, None] = 'f2c4a8e6b0d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Ancho de cada segmento de comments.path (PATH_SEGMENT_WIDTH del modelo)
+PATH_SEGMENT_WIDTH = 10
+
+
+def upgrade() -> None:
+    # En SQLite la clave foránea obliga a recrear la tabla (modo batch)
+    with op.batch_alter_table('comments') as batch_op:
+        batch_op.add_column(sa.Column('parent_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('path', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('depth', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_foreign_key('fk_comments_parent_id_comments', 'comments', ['parent_id'], ['id'])
+
+    # Los comentarios existentes son todos de primer nivel: la ruta es su id
+    if op.get_context().dialect.name == 'sqlite':
+        op.execute(f"UPDATE comments SET path = printf('%0{PATH_SEGMENT_WIDTH}d', id)")
+    else:
+        op.execute(f"UPDATE comments SET path = lpad(CAST(id AS VARCHAR), {PATH_SEGMENT_WIDTH}, '0')")
+
+    op.create_index('ix_comments_post_path', 'comments', ['post_id', 'path'])
+    op.create_index(
+        'ix_comments_post_roots',
+        'comments',
+        ['post_id', 'id'],
+        sqlite_where=sa.text('parent_id IS NULL'),
+        postgresql_where=sa.text('parent_id IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_post_roots', table_name='comments')
+    op.drop_index('ix_comments_post_path', table_name='comments')
+    with op.batch_alter_table('comments') as batch_op:
+        batch_op.drop_constraint('fk_comments_parent_id_comments', type_='foreignkey')
+        batch_op.drop_column('depth')
+        batch_op.drop_column('path')
+        batch_op.drop_column('parent_id')
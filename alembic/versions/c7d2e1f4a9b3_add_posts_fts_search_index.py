@@ -0,0 +1,69 @@
+"""add posts fts search index
+
+Revision ID: c7d2e1f4a9b3
+Revises: b4cffbf0e839
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e1f4a9b3'
+down_revision: Union[str, None] = 'b4cffbf0e839'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Índice de texto completo solo en SQLite (FTS5). En otros motores la
+    # búsqueda usa la tabla posts directamente.
+    if op.get_context().dialect.name != 'sqlite':
+        return
+
+    # Tabla virtual con contenido externo: el texto vive en posts y el
+    # índice se mantiene sincronizado con triggers
+    op.execute("""
+        CREATE VIRTUAL TABLE posts_fts USING fts5(
+            title,
+            content,
+            content='posts',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_fts_ai AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts(rowid, title, content)
+            VALUES (new.id, new.title, new.content);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_fts_ad AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO posts_fts(rowid, title, content)
+            VALUES (new.id, new.title, new.content);
+        END
+    """)
+    # Indexar los posts existentes
+    op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS posts_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS posts_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS posts_fts_ai")
+    op.execute("DROP TABLE IF EXISTS posts_fts")
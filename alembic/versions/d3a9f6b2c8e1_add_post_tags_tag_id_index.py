@@ -0,0 +1,28 @@
+"""add post_tags (tag_id, post_id) index
+
+Revision ID: d3a9f6b2c8e1
+Revises: c7d2e1f4a9b3
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a9f6b2c8e1'
+down_revision: Union[str, None] = 'c7d2e1f4a9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # La PK (post_id, tag_id) no sirve para buscar por tag; este índice
+    # permite recorrer los posts de un tag en orden de post_id
+    op.create_index('ix_post_tags_tag_id_post_id', 'post_tags', ['tag_id', 'post_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_tags_tag_id_post_id', table_name='post_tags')
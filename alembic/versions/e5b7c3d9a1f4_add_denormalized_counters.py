@@ -0,0 +1,51 @@
+"""add denormalized counters
+
+Revision ID: e5b7c3d9a1f4
+Revises: d3a9f6b2c8e1
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7c3d9a1f4'
+down_revision: Union[str, None] = 'd3a9f6b2c8e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('tags', sa.Column('post_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('users', sa.Column('post_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Calcular los contadores de los datos existentes
+    op.execute("""
+        UPDATE posts SET comment_count = (
+            SELECT count(*) FROM comments
+            WHERE comments.post_id = posts.id AND NOT comments.is_deleted
+        )
+    """)
+    op.execute("""
+        UPDATE users SET post_count = (
+            SELECT count(*) FROM posts
+            WHERE posts.user_id = users.id AND NOT posts.is_deleted
+        )
+    """)
+    op.execute("""
+        UPDATE tags SET post_count = (
+            SELECT count(*) FROM post_tags
+            JOIN posts ON posts.id = post_tags.post_id
+            WHERE post_tags.tag_id = tags.id AND NOT posts.is_deleted
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'post_count')
+    op.drop_column('tags', 'post_count')
+    op.drop_column('posts', 'comment_count')
@@ -0,0 +1,49 @@
+"""add foreign key and partial indexes for soft-delete queries
+
+Revision ID: f2c4a8e6b0d7
+Revises: e5b7c3d9a1f4
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c4a8e6b0d7'
+down_revision: Union[str, None] = 'e5b7c3d9a1f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _live(column: str = 'is_deleted') -> dict:
+    # Predicado de índice parcial: solo filas no borradas
+    return {
+        'sqlite_where': sa.text(f'{column} = 0'),
+        'postgresql_where': sa.text(f'NOT {column}'),
+    }
+
+
+def upgrade() -> None:
+    # Comentarios de un post: sirve tanto al listado paginado (SQLite añade el
+    # rowid a cada entrada, así que el orden por id sale del propio índice)
+    # como a selectinload(Post.comments), que no filtra por is_deleted
+    op.create_index('ix_comments_post_id', 'comments', ['post_id'], unique=False)
+    op.create_index('ix_comments_user_id', 'comments', ['user_id'], unique=False)
+    # Posts de un usuario (selectinload(User.posts)) y listado de posts vivos
+    op.create_index('ix_posts_user_id', 'posts', ['user_id'], unique=False)
+    op.create_index('ix_posts_id_live', 'posts', ['id'], unique=False, **_live())
+    # Listados paginados de usuarios y tags vivos
+    op.create_index('ix_users_id_live', 'users', ['id'], unique=False, **_live())
+    op.create_index('ix_tags_id_live', 'tags', ['id'], unique=False, **_live())
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tags_id_live', table_name='tags')
+    op.drop_index('ix_users_id_live', table_name='users')
+    op.drop_index('ix_posts_id_live', table_name='posts')
+    op.drop_index('ix_posts_user_id', table_name='posts')
+    op.drop_index('ix_comments_user_id', table_name='comments')
+    op.drop_index('ix_comments_post_id', table_name='comments')
@@ -0,0 +1,191 @@
+"""
+Comprueba con EXPLAIN QUERY PLAN que las consultas principales de la API
+usan índices y no recorren tablas completas. Pensado para ejecutarse en CI
+contra una base de datos SQLite migrada (alembic upgrade head).
+
+Termina con código 1 si alguna consulta hace un SCAN sin índice.
+
+Uso:
+    python -m app.commands.check_query_plans
+"""
+import asyncio
+import logging
+import sys
+from datetime import datetime
+from typing import List, Tuple
+
+from sqlalchemy import Dialect, Executable, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.pagination import encode_cursor, paginate
+from app.database.session import engine
+from app.models import Comment, Post, Tag, User
+from app.models.comment import comment_path, subtree_range
+from app.routers import comments, posts
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 10
+
+# Valores de ejemplo para los parámetros de las consultas
+CURSOR = encode_cursor(100)
+TAGS = ["python", "async"]
+
+
+def query_shapes() -> List[Tuple[str, Executable]]:
+    """Consultas de los routers, construidas con las mismas funciones que usan.
+
+    Las consultas de los selectinload las genera el ORM; se incluye su forma
+    (WHERE <fk> IN (...)) para comprobar que tienen índice.
+    """
+    thread_start, thread_end = subtree_range(comment_path(1))
+    return [
+        ("posts: listado", paginate(posts._post_list_query(None, "any", None), Post.id, 0, None, PAGE_SIZE)),
+        ("posts: listado por cursor", paginate(posts._post_list_query(None, "any", CURSOR), Post.id, 0, CURSOR, PAGE_SIZE)),
+        (
+            "posts: listado por tags (any) con cursor",
+            paginate(posts._post_list_query(TAGS, "any", CURSOR), Post.id, 0, CURSOR, PAGE_SIZE)
+        ),
+        (
+            "posts: listado por tags (all)",
+            paginate(posts._post_list_query(TAGS, "all", None), Post.id, 0, None, PAGE_SIZE)
+        ),
+        ("posts: detalle", posts._post_detail_query(1)),
+        ("posts: resumen", paginate(posts._post_summary_query(None, "any", None), Post.id, 0, None, PAGE_SIZE)),
+        (
+            "posts: resumen por tag con cursor",
+            paginate(posts._post_summary_query(TAGS, "any", CURSOR), Post.id, 0, CURSOR, PAGE_SIZE)
+        ),
+        (
+            "posts: búsqueda FTS",
+            posts.FTS_SEARCH_QUERY.bindparams(query=posts._fts_query("python async"), limit=PAGE_SIZE, skip=0)
+        ),
+        ("posts: export", posts._export_query(None, None, None, "any")),
+        (
+            "posts: export incremental por autor y tag",
+            posts._export_query(datetime(2024, 1, 1), "alice", TAGS, "any")
+        ),
+        ("posts: export, comentarios del bloque", posts._export_comments_query([1, 2, 3])),
+        ("posts: export, tags del bloque", posts._export_tags_query([1, 2, 3])),
+        (
+            "posts: selectinload(User.posts)",
+            select(Post).where(Post.user_id.in_([1, 2, 3]))
+        ),
+        (
+            "comments: listado por post",
+            paginate(comments._comments_by_post_query(1), Comment.id, 0, None, PAGE_SIZE)
+        ),
+        (
+            "comments: listado por post con cursor",
+            paginate(comments._comments_by_post_query(1), Comment.id, 0, CURSOR, PAGE_SIZE)
+        ),
+        (
+            "comments: selectinload(Post.comments)",
+            select(Comment).where(Comment.post_id.in_([1, 2, 3]))
+        ),
+        (
+            "comments: por autor",
+            select(Comment.id).where(Comment.user_id == 1)
+        ),
+        (
+            "comments: hilos de primer nivel por post",
+            paginate(comments._thread_roots_query(1), Comment.id, 0, CURSOR, PAGE_SIZE)
+        ),
+        ("comments: subárbol por rango de rutas", comments._thread_query(1, thread_start, thread_end, None)),
+        (
+            "users: listado",
+            select(User).where(User.is_deleted == False).order_by(User.id).limit(PAGE_SIZE)
+        ),
+        (
+            "users: login",
+            select(User).where(User.username == "alice")
+        ),
+        (
+            "tags: listado",
+            select(Tag).where(Tag.is_deleted == False).order_by(Tag.id).limit(PAGE_SIZE)
+        ),
+        (
+            "tags: por nombre",
+            select(Tag).where(Tag.name == "python", Tag.is_deleted == False)
+        ),
+    ]
+
+
+def explain_sql(stmt: Executable, dialect: Dialect) -> Tuple[str, tuple]:
+    """SQL del EXPLAIN QUERY PLAN de una consulta y sus parámetros posicionales.
+
+    Los parámetros se pasan aparte (no como literales) para que el plan sea
+    el mismo que el de la consulta que ejecuta el router.
+    """
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    return f"EXPLAIN QUERY PLAN {compiled}", tuple(params[name] for name in compiled.positiontup)
+
+
+async def explain(conn: AsyncConnection, stmt: Executable) -> List[str]:
+    """Pasos del EXPLAIN QUERY PLAN de una consulta."""
+    sql, params = explain_sql(stmt, conn.dialect)
+    result = await conn.exec_driver_sql(sql, params)
+    return [row[3] for row in result]
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Devuelve los pasos del plan que recorren una tabla sin usar índice.
+
+    Un SCAN de una tabla virtual FTS5 con restricción (p. ej. "INDEX 0:M2",
+    un MATCH) usa el índice de texto completo y no cuenta como recorrido,
+    como tampoco el del catálogo (sqlite_master).
+    """
+    scans = []
+    for detail in plan:
+        if not detail.startswith("SCAN ") or " USING " in detail or detail == "SCAN CONSTANT ROW":
+            continue
+        if detail.startswith("SCAN sqlite_"):
+            continue
+        _, virtual, constraint = detail.partition(" VIRTUAL TABLE INDEX ")
+        if virtual and constraint.partition(":")[2]:
+            continue
+        scans.append(detail)
+    return scans
+
+
+async def check_query_plans(db_engine: AsyncEngine) -> List[Tuple[str, List[str]]]:
+    """Ejecuta EXPLAIN QUERY PLAN para cada consulta.
+
+    Args:
+        db_engine (AsyncEngine): Engine SQLite con el esquema migrado.
+
+    Returns:
+        List[Tuple[str, List[str]]]: Consultas que hacen un recorrido completo
+            y los pasos del plan que lo provocan.
+    """
+    failures = []
+    async with db_engine.connect() as conn:
+        for name, stmt in query_shapes():
+            plan = await explain(conn, stmt)
+            logger.info("%s: %s", name, " | ".join(plan))
+            scans = full_scans(plan)
+            if scans:
+                failures.append((name, scans))
+    return failures
+
+
+async def main() -> int:
+    logging.basicConfig(level=logging.INFO)
+    if engine.dialect.name != "sqlite":
+        logger.error("EXPLAIN QUERY PLAN solo está soportado con SQLite")
+        await engine.dispose()
+        return 1
+
+    failures = await check_query_plans(engine)
+    await engine.dispose()
+    for name, scans in failures:
+        logger.error("Recorrido completo en '%s': %s", name, " | ".join(scans))
+    if failures:
+        return 1
+    logger.info("Todas las consultas usan índices")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
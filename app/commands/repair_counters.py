@@ -0,0 +1,68 @@
+"""
+Recalcula los contadores desnormalizados (posts.comment_count,
+users.post_count y tags.post_count) a partir de los datos reales.
+
+Uso:
+    python -m app.commands.repair_counters
+"""
+import asyncio
+import logging
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.session import AsyncSessionLocal, engine
+from app.models import Comment, Post, Tag, User, post_tags
+
+logger = logging.getLogger(__name__)
+
+
+async def repair_counters(db: AsyncSession) -> None:
+    """Recalcula todos los contadores con tres UPDATE con subconsultas correlacionadas."""
+    comment_count = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id, Comment.is_deleted == False)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(Post)
+        .values(comment_count=comment_count, updated_at=Post.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+    user_post_count = (
+        select(func.count(Post.id))
+        .where(Post.user_id == User.id, Post.is_deleted == False)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(User)
+        .values(post_count=user_post_count, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+    tag_post_count = (
+        select(func.count(post_tags.c.post_id))
+        .join(Post, Post.id == post_tags.c.post_id)
+        .where(post_tags.c.tag_id == Tag.id, Post.is_deleted == False)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(Tag)
+        .values(post_count=tag_post_count, updated_at=Tag.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+    await db.commit()
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    async with AsyncSessionLocal() as db:
+        await repair_counters(db)
+    await engine.dispose()
+    logger.info("Contadores recalculados")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,320 @@
+"""
+Siembra una base de datos vacía (ya migrada) con datos sintéticos
+deterministas: usuarios, tags, posts, post_tags y comentarios.
+
+Las filas se generan en streaming y se insertan por bloques con INSERT de
+Core (executemany), sin pasar por la API ni por el ORM. Todos los usuarios
+comparten una contraseña hasheada una sola vez, con una sal derivada de la
+semilla. Los comentarios por post, los posts por autor y los tags por post
+siguen distribuciones Zipf configurables, y los contadores desnormalizados
+se escriben al final sin tocar updated_at.
+
+Con la misma semilla y los mismos parámetros el resultado es idéntico.
+
+Uso:
+    python -m app.commands.seed --scale medium
+    python -m app.commands.seed --users 100000 --posts 1000000 --comments 10000000
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional
+
+import bcrypt
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.session import engine
+from app.models import Comment, Post, Tag, User, post_tags
+from app.models.comment import comment_path
+
+logger = logging.getLogger(__name__)
+
+# Fecha de la primera fila; las siguientes avanzan con el id
+BASE_TIME = datetime(2024, 1, 1)
+
+# Alfabeto base64 de bcrypt, para generar la sal a partir de la semilla. La
+# sal son 16 bytes en 22 caracteres: el último solo puede ser uno de 4
+BCRYPT_ALPHABET = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+BCRYPT_LAST_SALT_CHARS = ".Oeu"
+
+WORDS = (
+    "api rendimiento consulta indice cache latencia servidor cliente datos modelo "
+    "esquema tabla fila columna python async base sqlite postgres pool conexion "
+    "token usuario post comentario etiqueta busqueda pagina cursor lote prueba "
+    "metrica perfil memoria disco red proceso hilo tarea evento cola mensaje"
+).split()
+
+
+@dataclass
+class SeedConfig:
+    """Tamaño y forma de los datos sintéticos."""
+    users: int = 1_000
+    posts: int = 10_000
+    comments: int = 100_000
+    tags: int = 200
+    max_tags_per_post: int = 3
+    # Exponentes Zipf (0 = uniforme): cuanto mayor, más concentrado
+    comment_skew: float = 1.1
+    author_skew: float = 0.8
+    tag_skew: float = 1.0
+    chunk_size: int = 10_000
+    seed: int = 42
+    password: str = "password123"
+
+
+# Tamaños predefinidos para --scale
+PRESETS: Dict[str, Dict[str, int]] = {
+    "small": {"users": 1_000, "posts": 10_000, "comments": 100_000},
+    "medium": {"users": 10_000, "posts": 100_000, "comments": 1_000_000},
+    "large": {"users": 100_000, "posts": 1_000_000, "comments": 10_000_000},
+}
+
+
+class ZipfSampler:
+    """
+    Elige ids 1..n con probabilidad proporcional a 1 / rango**s.
+
+    Los rangos se reparten al azar entre los ids para que los más populares
+    no sean siempre los primeros. Con s = 0 la elección es uniforme.
+    """
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self._rng = rng
+        self._ids = list(range(1, n + 1))
+        rng.shuffle(self._ids)
+        self._cumulative: Optional[List[float]] = None
+        if s > 0:
+            self._cumulative = list(accumulate(1.0 / rank ** s for rank in range(1, n + 1)))
+            self._total = self._cumulative[-1]
+
+    def sample(self) -> int:
+        if self._cumulative is None:
+            return self._ids[int(self._rng.random() * len(self._ids))]
+        return self._ids[bisect_right(self._cumulative, self._rng.random() * self._total)]
+
+
+def _chunks(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _seeded_password_hash(password: str, rng: random.Random) -> str:
+    """Hash bcrypt con una sal derivada de la semilla, para que el seed sea reproducible."""
+    salt = "$2b$12$" + "".join(rng.choices(BCRYPT_ALPHABET, k=21)) + rng.choice(BCRYPT_LAST_SALT_CHARS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt.encode("ascii")).decode("utf-8")
+
+
+def _text_pool(rng: random.Random, size: int, words: int) -> List[str]:
+    """Frases pregeneradas: elegir de un pool es mucho más rápido que generar cada texto."""
+    return [" ".join(rng.choices(WORDS, k=words)).capitalize() for _ in range(size)]
+
+
+async def _insert_chunks(db_engine: AsyncEngine, table, rows: Iterator[dict], chunk_size: int) -> int:
+    """Inserta las filas por bloques, una transacción por bloque."""
+    total = 0
+    for chunk in _chunks(rows, chunk_size):
+        async with db_engine.begin() as conn:
+            await conn.execute(insert(table), chunk)
+        total += len(chunk)
+    return total
+
+
+async def _update_counters(db_engine: AsyncEngine, table, column: str, counts: Dict[int, int], chunk_size: int) -> None:
+    """Escribe contadores precalculados con UPDATE ... WHERE id = :target_id por bloques.
+
+    updated_at se asigna a sí mismo para que no se dispare su onupdate.
+    """
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("target_id"))
+        .values({column: bindparam("value"), "updated_at": table.c.updated_at})
+    )
+    rows = ({"target_id": key, "value": value} for key, value in counts.items() if value)
+    for chunk in _chunks(rows, chunk_size):
+        async with db_engine.begin() as conn:
+            await conn.execute(stmt, chunk)
+
+
+async def seed_database(db_engine: AsyncEngine, config: SeedConfig) -> Dict[str, int]:
+    """Siembra la base de datos con los datos descritos en `config`.
+
+    Args:
+        db_engine (AsyncEngine): Engine de una base de datos migrada y vacía.
+        config (SeedConfig): Tamaños, distribuciones y semilla.
+
+    Raises:
+        RuntimeError: Si la base de datos ya tiene usuarios.
+
+    Returns:
+        Dict[str, int]: Número de filas insertadas por tabla.
+    """
+    async with db_engine.connect() as conn:
+        existing = await conn.scalar(select(func.count()).select_from(User.__table__))
+    if existing:
+        raise RuntimeError("La base de datos ya tiene datos; el seed necesita una base vacía")
+
+    rng = random.Random(config.seed)
+    users_table = User.__table__
+    posts_table = Post.__table__
+    comments_table = Comment.__table__
+    tags_table = Tag.__table__
+    chunk_size = config.chunk_size
+
+    # Autor de cada post, calculado antes para insertar users.post_count directo
+    author_sampler = ZipfSampler(config.users, config.author_skew, rng)
+    post_authors = [author_sampler.sample() for _ in range(config.posts)]
+    user_post_count = [0] * (config.users + 1)
+    for author_id in post_authors:
+        user_post_count[author_id] += 1
+
+    hashed_password = _seeded_password_hash(config.password, rng)
+
+    def user_rows() -> Iterator[dict]:
+        for user_id in range(1, config.users + 1):
+            created_at = BASE_TIME + timedelta(minutes=user_id)
+            yield {
+                "id": user_id,
+                "username": f"user{user_id}",
+                "email": f"user{user_id}@example.com",
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "is_deleted": False,
+                "post_count": user_post_count[user_id],
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    def tag_rows() -> Iterator[dict]:
+        for tag_id in range(1, config.tags + 1):
+            yield {
+                "id": tag_id,
+                "name": f"tag{tag_id}",
+                "is_deleted": False,
+                "post_count": 0,
+                "created_at": BASE_TIME,
+                "updated_at": BASE_TIME,
+            }
+
+    counts = {}
+    counts["users"] = await _insert_chunks(db_engine, users_table, user_rows(), chunk_size)
+    counts["tags"] = await _insert_chunks(db_engine, tags_table, tag_rows(), chunk_size)
+
+    titles = _text_pool(rng, 1_000, 6)
+    bodies = _text_pool(rng, 1_000, 40)
+
+    def post_rows() -> Iterator[dict]:
+        for post_id, author_id in enumerate(post_authors, start=1):
+            created_at = BASE_TIME + timedelta(seconds=30 * post_id)
+            yield {
+                "id": post_id,
+                "title": rng.choice(titles),
+                "content": rng.choice(bodies),
+                "user_id": author_id,
+                "is_deleted": False,
+                "comment_count": 0,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    counts["posts"] = await _insert_chunks(db_engine, posts_table, post_rows(), chunk_size)
+    del post_authors
+
+    # Tags de cada post: entre 0 y max_tags_per_post, distintos, con sesgo Zipf
+    tag_post_count: Dict[int, int] = {}
+
+    def post_tag_rows() -> Iterator[dict]:
+        if not config.tags:
+            return
+        tag_sampler = ZipfSampler(config.tags, config.tag_skew, rng)
+        for post_id in range(1, config.posts + 1):
+            wanted = min(rng.randint(0, config.max_tags_per_post), config.tags)
+            chosen = set()
+            while len(chosen) < wanted:
+                chosen.add(tag_sampler.sample())
+            for tag_id in sorted(chosen):
+                tag_post_count[tag_id] = tag_post_count.get(tag_id, 0) + 1
+                yield {"post_id": post_id, "tag_id": tag_id}
+
+    counts["post_tags"] = await _insert_chunks(db_engine, post_tags, post_tag_rows(), chunk_size)
+
+    # Post de cada comentario con sesgo Zipf; el autor, uniforme
+    post_comment_count: Dict[int, int] = {}
+    phrases = _text_pool(rng, 1_000, 12)
+
+    def comment_rows() -> Iterator[dict]:
+        if not config.posts:
+            return
+        post_sampler = ZipfSampler(config.posts, config.comment_skew, rng)
+        for comment_id in range(1, config.comments + 1):
+            post_id = post_sampler.sample()
+            post_comment_count[post_id] = post_comment_count.get(post_id, 0) + 1
+            created_at = BASE_TIME + timedelta(seconds=3 * comment_id)
+            yield {
+                "id": comment_id,
+                "content": rng.choice(phrases),
+                "post_id": post_id,
+                "user_id": rng.randint(1, config.users),
+                # Comentarios de primer nivel, sin respuestas
+                "parent_id": None,
+                "path": comment_path(comment_id),
+                "depth": 0,
+                "is_deleted": False,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    counts["comments"] = await _insert_chunks(db_engine, comments_table, comment_rows(), chunk_size)
+
+    await _update_counters(db_engine, posts_table, "comment_count", post_comment_count, chunk_size)
+    await _update_counters(db_engine, tags_table, "post_count", tag_post_count, chunk_size)
+    return counts
+
+
+def parse_args(argv: Optional[List[str]] = None) -> SeedConfig:
+    parser = argparse.ArgumentParser(description="Siembra datos sintéticos deterministas")
+    parser.add_argument("--scale", choices=sorted(PRESETS), help="Tamaño predefinido (users/posts/comments)")
+    for config_field in fields(SeedConfig):
+        parser.add_argument(
+            f"--{config_field.name.replace('_', '-')}",
+            type=type(config_field.default),
+            default=None,
+            help=f"por defecto {config_field.default}"
+        )
+    args = parser.parse_args(argv)
+
+    values = dict(PRESETS.get(args.scale, {}))
+    for config_field in fields(SeedConfig):
+        value = getattr(args, config_field.name)
+        if value is not None:
+            values[config_field.name] = value
+    return SeedConfig(**values)
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    config = parse_args(argv)
+    # Sin echo de SQL: serían millones de líneas
+    engine.sync_engine.echo = False
+
+    start = time.perf_counter()
+    logger.info("Sembrando con %s", asdict(config))
+    counts = await seed_database(engine, config)
+    await engine.dispose()
+    logger.info("Filas insertadas: %s en %.1fs", counts, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,267 @@
+"""
+Arranca la API con uno o varios workers de uvicorn.
+
+Con --preload la aplicación se importa una sola vez en el proceso
+principal (modelos, esquemas y validadores de respuesta ya compilados) y
+los workers se crean con fork sobre el mismo socket: arrancan sin repetir
+ese trabajo y comparten esa memoria copy-on-write. Las conexiones a la
+base de datos se abren en cada worker, en el lifespan, después del fork.
+Si un worker termina de forma inesperada se crea otro, con una espera que
+crece si vuelve a caer enseguida; si falla al arrancar (p. ej. la base no
+responde en el warmup) se detienen todos.
+
+Sin --preload se usa el supervisor de uvicorn (como uvicorn --workers),
+que importa la aplicación en cada worker.
+
+En los dos modos, al recibir SIGTERM cada worker pasa /health/ready a 503
+y sigue atendiendo SHUTDOWN_DRAIN_DELAY_SECONDS antes de cerrar el socket
+y esperar a los requests en curso (SHUTDOWN_TIMEOUT_SECONDS).
+
+Con más de un worker se desactivan los caches que dependen de invalidarse
+en las escrituras (usuarios autenticados y respuestas con ETag): son de
+cada proceso, y una escritura solo invalidaría la copia del worker que la
+atiende. Cada request autenticado vuelve a leer el usuario y las
+respuestas se construyen siempre (el ETag y los 304 siguen funcionando);
+ver .env.example.
+
+Uso:
+    python -m app.commands.serve --workers 4 --preload
+    python -m app.commands.serve --host 0.0.0.0 --port 8000 --workers 2
+"""
+import argparse
+import logging
+import os
+import signal
+import threading
+import time
+from types import FrameType
+from typing import Dict, List, Optional
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+APP_IMPORT = "app.main:app"
+
+# Código de salida de un worker que no pudo arrancar (como uvicorn)
+STARTUP_FAILURE = 3
+
+# Tamaño de los caches locales al proceso que se invalidan en las escrituras
+PROCESS_LOCAL_CACHES = ("PRINCIPAL_CACHE_SIZE", "RESPONSE_CACHE_SIZE")
+
+# Espera antes de recrear un worker caído: se duplica con cada caída seguida
+# hasta RESPAWN_MAX_DELAY, y vuelve a la inicial si el worker llevaba al
+# menos RESPAWN_RESET_SECONDS en marcha
+RESPAWN_DELAY = 0.5
+RESPAWN_MAX_DELAY = 30.0
+RESPAWN_RESET_SECONDS = 60.0
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    Servidor de uvicorn que drena antes de dejar de aceptar conexiones.
+
+    Con el primer SIGTERM deja de reportar readiness y programa la salida
+    para SHUTDOWN_DRAIN_DELAY_SECONDS después; mientras tanto sigue
+    atendiendo. SIGINT o un segundo SIGTERM cierran sin esa espera.
+    """
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        from app.core.lifespan import begin_drain, readiness
+
+        delay = settings.SHUTDOWN_DRAIN_DELAY_SECONDS
+        first_signal = not readiness.draining and not self.should_exit
+        begin_drain()
+        if sig == signal.SIGTERM and first_signal and delay > 0:
+            timer = threading.Timer(delay, self._stop_accepting)
+            timer.daemon = True
+            timer.start()
+            return
+        super().handle_exit(sig, frame)
+
+    def _stop_accepting(self) -> None:
+        # uvicorn revisa should_exit en su bucle principal
+        self.should_exit = True
+
+
+class DrainingMultiprocess(Multiprocess):
+    """
+    Supervisor de uvicorn que envía SIGTERM a todos los workers a la vez.
+
+    El de uvicorn los detiene uno a uno (terminate y join), así que los
+    demás seguirían respondiendo 200 en /health/ready mientras drena el
+    primero.
+    """
+
+    def shutdown(self) -> None:
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        logger.info("Proceso principal %d detenido", self.pid)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Arranca la API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--preload", action="store_true",
+        help="Importar la aplicación antes de crear los workers con fork (solo POSIX)"
+    )
+    parser.add_argument(
+        "--proxy-headers", action="store_true",
+        help="Tomar la IP del cliente de X-Forwarded-For (detrás de un proxy)"
+    )
+    return parser.parse_args(argv)
+
+
+def disable_process_local_caches() -> None:
+    """Desactiva los caches que no se pueden invalidar entre workers.
+
+    Se llama antes de importar la aplicación: cambia `settings` para los
+    workers creados con fork y el entorno para los que importan la
+    aplicación de nuevo (supervisor de uvicorn).
+    """
+    for name in PROCESS_LOCAL_CACHES:
+        if getattr(settings, name) > 0:
+            logger.warning("%s=0: el cache es local a cada worker y no se invalidaría en los demás", name)
+        setattr(settings, name, 0)
+        os.environ[name] = "0"
+
+
+def _after_fork() -> None:
+    """Descarta en el worker las conexiones heredadas del proceso principal."""
+    from app.database.session import engine, read_engine
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    engine.sync_engine.dispose(close=False)
+    read_engine.sync_engine.dispose(close=False)
+
+
+def respawn_delay(consecutive_crashes: int) -> float:
+    """Segundos de espera antes de recrear un worker tras `consecutive_crashes` caídas seguidas."""
+    return min(RESPAWN_DELAY * 2 ** max(consecutive_crashes - 1, 0), RESPAWN_MAX_DELAY)
+
+
+def run_preloaded(args: argparse.Namespace) -> int:
+    """Importa la aplicación, crea los workers con fork y los supervisa.
+
+    Returns:
+        int: Código de salida (STARTUP_FAILURE si un worker no pudo arrancar).
+    """
+    from app.main import app
+    from app.core.lifespan import warm_validators
+
+    warm_validators(app)
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        proxy_headers=args.proxy_headers,
+        timeout_graceful_shutdown=settings.SHUTDOWN_TIMEOUT_SECONDS,
+    )
+    sock = config.bind_socket()
+    # pid -> momento en que se creó (time.monotonic)
+    workers: Dict[int, float] = {}
+    stopping = False
+    exit_code = 0
+    consecutive_crashes = 0
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            worker_exit = 0
+            try:
+                _after_fork()
+                server = DrainingServer(config)
+                server.run(sockets=[sock])
+                if not server.started:
+                    worker_exit = STARTUP_FAILURE
+            except BaseException:
+                logger.exception("Error en el worker %d", os.getpid())
+                worker_exit = 1
+            finally:
+                os._exit(worker_exit)
+        workers[pid] = time.monotonic()
+        logger.info("Worker %d iniciado", pid)
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(args.workers):
+        spawn()
+
+    while workers:
+        try:
+            pid, wait_status = os.wait()
+        except ChildProcessError:
+            break
+        started_at = workers.pop(pid, None)
+        if not stopping and os.waitstatus_to_exitcode(wait_status) == STARTUP_FAILURE:
+            exit_code = STARTUP_FAILURE
+            logger.error("Worker %d no pudo arrancar; se detienen los demás", pid)
+            stop(signal.SIGTERM, None)
+        elif not stopping:
+            uptime = time.monotonic() - started_at if started_at is not None else 0.0
+            consecutive_crashes = 1 if uptime >= RESPAWN_RESET_SECONDS else consecutive_crashes + 1
+            delay = respawn_delay(consecutive_crashes)
+            logger.warning(
+                "Worker %d terminó (status %d); se crea otro en %.1fs", pid, wait_status, delay
+            )
+            # Espera en pasos cortos para atender un SIGTERM sin esperar al final
+            deadline = time.monotonic() + delay
+            while not stopping and time.monotonic() < deadline:
+                time.sleep(min(0.1, delay))
+            if not stopping:
+                spawn()
+    sock.close()
+    return exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    if args.workers > 1:
+        disable_process_local_caches()
+    if args.preload:
+        if not hasattr(os, "fork"):
+            raise SystemExit("--preload necesita fork (Linux/macOS)")
+        exit_code = run_preloaded(args)
+        if exit_code:
+            raise SystemExit(exit_code)
+        return
+
+    config = uvicorn.Config(
+        APP_IMPORT,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        proxy_headers=args.proxy_headers,
+        timeout_graceful_shutdown=settings.SHUTDOWN_TIMEOUT_SECONDS,
+    )
+    server = DrainingServer(config)
+    if config.workers > 1:
+        sock = config.bind_socket()
+        DrainingMultiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+        if not server.started:
+            raise SystemExit(STARTUP_FAILURE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from typing import List, Tuple, Type, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.schemas.bulk import BulkCreateRequest, BulkItemError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def validate_bulk_items(
+    payload: BulkCreateRequest,
+    schema: Type[ModelT]
+) -> Tuple[List[Tuple[int, ModelT]], List[BulkItemError]]:
+    """Valida cada elemento del lote por separado.
+
+    Args:
+        payload (BulkCreateRequest): Lote recibido.
+        schema (Type[ModelT]): Esquema de creación de cada elemento.
+
+    Raises:
+        HTTPException: 413 si el lote supera BULK_MAX_ITEMS.
+
+    Returns:
+        Tuple: Elementos válidos con su índice original y errores por índice.
+    """
+    if len(payload.items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"El lote no puede tener más de {settings.BULK_MAX_ITEMS} elementos"
+        )
+
+    valid: List[Tuple[int, ModelT]] = []
+    errors: List[BulkItemError] = []
+    for index, item in enumerate(payload.items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as exc:
+            errors.append(BulkItemError(
+                index=index,
+                detail=exc.errors(include_url=False, include_context=False, include_input=False)
+            ))
+    return valid, errors
+
+
+def raise_if_nothing_valid(valid: list, errors: List[BulkItemError]) -> None:
+    """Responde 422 con los errores por elemento si ningún elemento es válido."""
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors]
+        )
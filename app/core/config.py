@@ -1,12 +1,117 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Réplica opcional para las rutas de lectura
+    READ_DATABASE_URL: Optional[str] = None
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Perfil de ejecución: "development" o "production"
+    ENVIRONMENT: str = "development"
+
+    # Engine de la base de datos. Los valores en None toman el
+    # default del perfil (ver engine_profile)
+    DB_ECHO: Optional[bool] = None
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # PRAGMAs aplicados a cada conexión SQLite
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE: int = -64000
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Cache de usuarios autenticados (get_current_user)
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Pool de threads para bcrypt
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+
+    # Cache de tokens JWT ya verificados
+    TOKEN_CACHE_SIZE: int = 4096
+
+    # Máximo de elementos por petición en los endpoints /bulk
+    BULK_MAX_ITEMS: int = 500
+
+    # Cache de respuestas con ETag (detalle de posts y tags)
+    RESPONSE_CACHE_SIZE: int = 2048
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+
+    # Aviso en el log cuando un request supera este número de sentencias SQL,
+    # o repite la misma sentencia este número de veces (posible N+1)
+    DB_QUERY_WARN_THRESHOLD: int = 20
+    DB_REPEATED_QUERY_THRESHOLD: int = 5
+
+    # Compresión de respuestas: gzip y brotli (requirements.txt); zstd solo
+    # si se instala el paquete opcional zstandard
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Rate limit (token bucket) con políticas "<requests>/<second|minute|hour|day>";
+    # vacío o "0" desactiva la política. Login: por IP y por username;
+    # registro: por IP; escrituras (POST/PUT/PATCH/DELETE): por usuario o IP
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN: str = "10/minute"
+    RATE_LIMIT_REGISTER: str = "5/minute"
+    RATE_LIMIT_WRITE: str = "120/minute"
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    # Archivo SQLite para compartir los límites entre workers (None: en memoria)
+    RATE_LIMIT_SQLITE_PATH: Optional[str] = None
+
+    # Warmup al arrancar (lifespan). Conexiones a abrir por pool (None: pool_size),
+    # lectura de las páginas de los índices y rutas GET separadas por comas
+    # que se piden para llenar los caches, p. ej. "/tags/,/posts/"
+    WARMUP_POOL_CONNECTIONS: Optional[int] = None
+    WARMUP_HOT_PAGES: bool = False
+    WARMUP_PATHS: str = ""
+    # Segundos que el servidor sigue aceptando tráfico tras SIGTERM con
+    # /health/ready en 503, para que el balanceador lo saque de rotación
+    SHUTDOWN_DRAIN_DELAY_SECONDS: float = 5.0
+    # Espera máxima a los requests en curso al apagar
+    SHUTDOWN_TIMEOUT_SECONDS: int = 30
+
+    # Hilos de comentarios: niveles máximos de respuestas y máximo de
+    # comentarios devueltos por GET de un hilo o de una página de hilos
+    COMMENT_MAX_DEPTH: int = 32
+    COMMENT_THREAD_MAX_ITEMS: int = 1000
+
     class Config:
         env_file = ".env"
+
+    @property
+    def is_production(self) -> bool:
+        return self.ENVIRONMENT.lower() in ("production", "prod")
+
+    def engine_profile(self) -> dict:
+        """Opciones del engine según el perfil, con los overrides del entorno.
+
+        Returns:
+            dict: echo, pool_size, max_overflow, pool_timeout, pool_recycle y pool_pre_ping.
+        """
+        if self.is_production:
+            defaults = {"echo": False, "pool_size": 20, "max_overflow": 10}
+        else:
+            defaults = {"echo": True, "pool_size": 5, "max_overflow": 5}
+
+        return {
+            "echo": defaults["echo"] if self.DB_ECHO is None else self.DB_ECHO,
+            "pool_size": defaults["pool_size"] if self.DB_POOL_SIZE is None else self.DB_POOL_SIZE,
+            "max_overflow": defaults["max_overflow"] if self.DB_MAX_OVERFLOW is None else self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+        }
         
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -2,15 +2,50 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, inspect
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.database.session import get_db
 from app.models.user import User
 from app.core.security import verify_access_token
+from app.core.cache import TTLCache
+from app.core.config import settings
 
 # Define el endpoint de login para OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Cache de usuarios activos por id. Guarda los valores de las columnas,
+# no la instancia ORM, para no compartir objetos entre sesiones.
+principal_cache = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+_USER_COLUMNS = [attr.key for attr in inspect(User).column_attrs]
+
+
+def cache_principal(user: User) -> None:
+    """Guarda en el cache los datos de un usuario activo."""
+    if user.is_active and not user.is_deleted:
+        principal_cache.set(user.id, {key: getattr(user, key) for key in _USER_COLUMNS})
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Elimina un usuario del cache para que el próximo request lo relea de la BD."""
+    principal_cache.invalidate(user_id)
+
+
+def _user_from_cache(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Reconstruye el usuario desde el cache y lo asocia a la sesión sin hacer SELECT."""
+    data = principal_cache.get(user_id)
+    if data is None:
+        return None
+    
+    user = User(**data)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
@@ -35,12 +70,16 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    # Buscar el usuario en la BD
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
-    
+    # Buscar el usuario en el cache y, si no está, en la BD
+    user = _user_from_cache(db, int(user_id))
     if user is None:
-        raise credentials_exception
+        result = await db.execute(select(User).where(User.id == int(user_id)))
+        user = result.scalar_one_or_none()
+        
+        if user is None:
+            raise credentials_exception
+        
+        cache_principal(user)
     
     if not user.is_active:
         raise HTTPException(
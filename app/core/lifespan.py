@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.core.rate_limit import rate_limiter
+from app.core.responses import type_adapter
+from app.core.security import hashing_pool
+from app.database.base import Base
+from app.database.session import engine, read_engine
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Estado del proceso para el endpoint de readiness y /metrics."""
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.warmup_seconds = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "draining": self.draining,
+            "warmup_seconds": self.warmup_seconds,
+        }
+
+
+readiness = Readiness()
+
+
+def warm_validators(app: FastAPI) -> int:
+    """Compila los TypeAdapter de los response_model de todas las rutas.
+
+    Son los que usan model_response y serialize; sin esto se compilan en el
+    primer request de cada ruta. No abre conexiones, así que se puede llamar
+    en el proceso principal antes de hacer fork de los workers.
+
+    Returns:
+        int: Número de esquemas compilados.
+    """
+    schemas = {
+        route.response_model for route in app.routes
+        if isinstance(route, APIRoute) and route.response_model is not None
+    }
+    for schema in schemas:
+        type_adapter(schema)
+    return len(schemas)
+
+
+async def open_pool_connections(db_engine: AsyncEngine, count: Optional[int] = None) -> int:
+    """Abre a la vez `count` conexiones del pool y las devuelve, ya configuradas.
+
+    Por defecto abre tantas como pool_size. Si la base no responde, el
+    arranque falla aquí en lugar de en el primer request.
+
+    Returns:
+        int: Número de conexiones abiertas.
+    """
+    pool = db_engine.sync_engine.pool
+    if count is None:
+        count = pool.size() if isinstance(pool, QueuePool) else 1
+    async with AsyncExitStack() as stack:
+        for _ in range(max(count, 1)):
+            conn = await stack.enter_async_context(db_engine.connect())
+            await conn.execute(text("SELECT 1"))
+    return max(count, 1)
+
+
+async def warm_hot_pages(db_engine: AsyncEngine) -> None:
+    """Recorre los índices más pequeños de cada tabla (count(*)) para traer
+    sus páginas al cache del sistema operativo y de SQLite."""
+    async with db_engine.connect() as conn:
+        for table in Base.metadata.sorted_tables:
+            await conn.execute(select(func.count()).select_from(table))
+
+
+async def _internal_get(app: ASGIApp, path: str) -> int:
+    """Ejecuta un GET contra la propia aplicación, sin red, y devuelve el status."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("latin-1"),
+        "root_path": "",
+        "headers": [(b"host", b"warmup")],
+        "client": ("127.0.0.1", 0),
+        "server": ("warmup", 80),
+    }
+    status_code = 500
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+def _warmup_paths() -> List[str]:
+    return [path.strip() for path in settings.WARMUP_PATHS.split(",") if path.strip()]
+
+
+async def warmup(app: FastAPI) -> None:
+    """Prepara el proceso antes de aceptar tráfico.
+
+    Compila los validadores de respuesta, abre las conexiones de los pools
+    de escritura y lectura y, si está configurado, trae a memoria las
+    páginas de los índices (WARMUP_HOT_PAGES) y llena los caches pidiendo
+    las rutas de WARMUP_PATHS.
+    """
+    start = time.perf_counter()
+    schemas = warm_validators(app)
+    connections = await open_pool_connections(engine, settings.WARMUP_POOL_CONNECTIONS)
+    if read_engine is not engine:
+        connections += await open_pool_connections(read_engine, settings.WARMUP_POOL_CONNECTIONS)
+    if settings.WARMUP_HOT_PAGES:
+        await warm_hot_pages(read_engine)
+    for path in _warmup_paths():
+        status_code = await _internal_get(app, path)
+        if status_code >= 400:
+            logger.warning("Warmup: GET %s respondió %s", path, status_code)
+
+    readiness.warmup_seconds = time.perf_counter() - start
+    readiness.ready = True
+    logger.info(
+        "Warmup completado en %.3fs: %d esquemas, %d conexiones",
+        readiness.warmup_seconds, schemas, connections
+    )
+
+
+def begin_drain() -> None:
+    """Deja de reportar readiness: /health/ready responde 503 desde ahora.
+
+    Lo llama el servidor (app.commands.serve) al recibir SIGTERM, mientras
+    todavía acepta conexiones, para que el balanceador deje de enviarle
+    tráfico antes de que se cierre el socket.
+    """
+    if not readiness.draining:
+        logger.info("Drenando: /health/ready responde 503")
+    readiness.ready = False
+    readiness.draining = True
+
+
+async def shutdown() -> None:
+    """Cierra las conexiones de la base de datos y los pools del proceso."""
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    await asyncio.to_thread(hashing_pool.shutdown)
+    rate_limiter.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Lifespan de la aplicación: warmup al arrancar y cierre al apagar.
+
+    El shutdown del lifespan corre cuando uvicorn ya dejó de aceptar
+    conexiones y esperó a los requests en curso (timeout_graceful_shutdown);
+    aquí solo se liberan los recursos.
+    """
+    await warmup(app)
+    try:
+        yield
+    finally:
+        begin_drain()
+        if metrics_registry.in_flight > 0:
+            logger.warning(
+                "Apagado con %d requests aún en curso tras el timeout", metrics_registry.in_flight
+            )
+        await shutdown()
+        readiness.draining = False
+        logger.info("Apagado completado")
@@ -0,0 +1,128 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Mapping, Tuple
+
+# Buckets en segundos para la latencia y en bytes para el tamaño de respuesta
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class Histogram:
+    """Histograma acumulativo con buckets fijos, al estilo Prometheus."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Devuelve pares (le, conteo acumulado), incluyendo +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((_format_value(bound), total))
+        result.append(("+Inf", total + self.counts[-1]))
+        return result
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    """
+    Métricas HTTP del proceso: conteo por ruta y status, histogramas de
+    latencia y tamaño de respuesta, y requests en curso.
+
+    Las rutas se identifican por su plantilla (por ejemplo /posts/{post_id})
+    para que el número de series no crezca con los ids.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.response_size: Dict[Tuple[str, str], Histogram] = {}
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status_code: int, duration: float, size: int) -> None:
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            status_key = (method, route, status_code)
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.response_size[key] = Histogram(SIZE_BUCKETS)
+            self.latency[key].observe(duration)
+            self.response_size[key].observe(size)
+
+    def render(self) -> str:
+        """Serializa las métricas en el formato de texto de Prometheus."""
+        lines: List[str] = []
+        with self._lock:
+            lines.append("# HELP http_requests_in_flight Requests HTTP en curso.")
+            lines.append("# TYPE http_requests_in_flight gauge")
+            lines.append(f"http_requests_in_flight {self.in_flight}")
+
+            lines.append("# HELP http_requests_total Requests HTTP por ruta y status.")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route, status_code), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=str(status_code))} {count}")
+
+            _render_histograms(
+                lines, "http_request_duration_seconds", "Latencia de los requests HTTP.", self.latency
+            )
+            _render_histograms(
+                lines, "http_response_size_bytes", "Tamaño del cuerpo de las respuestas HTTP.", self.response_size
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _render_histograms(lines: List[str], name: str, help_text: str, histograms: Mapping[Tuple[str, str], Histogram]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), histogram in sorted(histograms.items()):
+        for bound, count in histogram.cumulative():
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {count}")
+        lines.append(f"{name}_sum{_labels(method=method, route=route)} {_format_value(histogram.sum)}")
+        lines.append(f"{name}_count{_labels(method=method, route=route)} {histogram.count}")
+
+
+def render_gauges(prefix: str, help_text: str, stats: Mapping[str, float]) -> str:
+    """Convierte un diccionario de estadísticas (por ejemplo cache.stats()) en gauges."""
+    lines = []
+    for key, value in stats.items():
+        if not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines.append(f"# HELP {name} {help_text}: {key}.")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {_format_value(float(value))}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,97 @@
+import base64
+import json
+from typing import Dict, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select
+
+# Header en el que se devuelve el cursor de la siguiente página
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Genera un cursor opaco a partir del id del último registro de la página.
+
+    Args:
+        last_id (int): Id del último registro devuelto.
+
+    Returns:
+        str: Cursor codificado en base64 url-safe.
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decodifica un cursor generado por encode_cursor.
+
+    Args:
+        cursor (str): Cursor recibido en el parámetro `after`.
+
+    Raises:
+        HTTPException: Si el cursor no es válido.
+
+    Returns:
+        int: Id del último registro de la página anterior.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = data["id"]
+        if not isinstance(last_id, int):
+            raise ValueError
+        return last_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+
+
+def paginate(stmt: Select, id_column, skip: int, after: Optional[str], limit: int) -> Select:
+    """Aplica paginación por cursor (keyset) o por offset a una consulta.
+
+    Con `after` se filtra por `id > cursor` y se ignora `skip`, de modo que
+    la base de datos salta directamente por el índice de la clave primaria
+    en lugar de recorrer y descartar las filas anteriores.
+
+    Args:
+        stmt (Select): Consulta a paginar.
+        id_column: Columna id del modelo por la que se ordena.
+        skip (int): Registros a omitir (modo offset).
+        after (Optional[str]): Cursor de la página anterior (modo keyset).
+        limit (int): Número máximo de registros.
+
+    Returns:
+        Select: Consulta ordenada por id y paginada.
+    """
+    stmt = stmt.order_by(id_column)
+    if after is not None:
+        return stmt.where(id_column > decode_cursor(after)).limit(limit)
+    return stmt.offset(skip).limit(limit)
+
+
+def next_cursor_headers(items: Sequence, limit: int) -> Dict[str, str]:
+    """Devuelve el header X-Next-Cursor si la página está completa.
+
+    Args:
+        items (Sequence): Registros devueltos en la página.
+        limit (int): Tamaño de página solicitado.
+
+    Returns:
+        Dict[str, str]: Headers a añadir a la respuesta (vacío si no hay más páginas).
+    """
+    if items and len(items) == limit:
+        return {NEXT_CURSOR_HEADER: encode_cursor(items[-1].id)}
+    return {}
+
+
+def set_next_cursor(response: Response, items: Sequence, limit: int) -> None:
+    """Añade el header X-Next-Cursor si la página está completa.
+
+    Args:
+        response (Response): Respuesta de FastAPI.
+        items (Sequence): Registros devueltos en la página.
+        limit (int): Tamaño de página solicitado.
+    """
+    response.headers.update(next_cursor_headers(items, limit))
@@ -0,0 +1,331 @@
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.core.config import settings
+from app.core.security import verify_access_token
+
+# Métodos que modifican datos y pasan por la política de escritura
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """
+    Token bucket: admite ráfagas de hasta `capacity` requests y se recarga
+    a razón de `capacity` tokens cada `period` segundos.
+    """
+    name: str
+    capacity: int
+    period: float
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> Optional["RateLimitPolicy"]:
+        """Crea una política desde un texto como "10/minute".
+
+        Args:
+            name (str): Nombre de la política (prefijo de las claves).
+            spec (str): "<requests>/<second|minute|hour|day>"; vacío o "0" la desactiva.
+
+        Raises:
+            ValueError: Si el formato no es válido.
+
+        Returns:
+            Optional[RateLimitPolicy]: La política, o None si está desactivada.
+        """
+        spec = spec.strip()
+        if not spec or spec == "0":
+            return None
+        count, _, unit = spec.partition("/")
+        period = _PERIODS.get(unit.strip().lower().rstrip("s"))
+        if period is None or not count.strip().isdigit():
+            raise ValueError(f"Política de rate limit inválida: {spec!r}")
+        capacity = int(count)
+        return cls(name=name, capacity=capacity, period=period) if capacity > 0 else None
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    remaining: float
+    # Segundos hasta que haya un token disponible (0 si se admitió)
+    retry_after: float
+
+
+def _take_token(tokens: float, elapsed: float, policy: RateLimitPolicy) -> Tuple[float, RateLimitResult]:
+    """Recarga el bucket según el tiempo transcurrido e intenta consumir un token."""
+    tokens = min(policy.capacity, tokens + max(elapsed, 0.0) * policy.refill_rate)
+    if tokens >= 1:
+        tokens -= 1
+        return tokens, RateLimitResult(True, tokens, 0.0)
+    return tokens, RateLimitResult(False, tokens, (1 - tokens) / policy.refill_rate)
+
+
+class MemoryRateLimitStore:
+    """
+    Buckets en memoria del proceso.
+
+    Las claves se reparten en shards, cada uno con su lock y su LRU, para que
+    requests de clientes distintos no compitan por el mismo lock. Cada
+    comprobación es O(1). Un bucket desalojado equivale a uno lleno, así que
+    el límite de claves solo puede hacer la política más permisiva.
+    """
+
+    def __init__(self, shards: int, max_keys: int):
+        """
+        Args:
+            shards (int): Número de shards (locks independientes).
+            max_keys (int): Máximo de buckets en memoria entre todos los shards.
+        """
+        shards = max(1, shards)
+        self._shards: List[Tuple[threading.Lock, "OrderedDict[str, List[float]]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+        self._max_per_shard = max(1, max_keys // shards)
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = [float(policy.capacity), now]
+                if len(buckets) > self._max_per_shard:
+                    buckets.popitem(last=False)
+            else:
+                buckets.move_to_end(key)
+            bucket[0], result = _take_token(bucket[0], now - bucket[1], policy)
+            bucket[1] = now
+        return result
+
+    async def refund(self, key: str, policy: RateLimitPolicy) -> None:
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(float(policy.capacity), bucket[0] + 1)
+
+    def size(self) -> int:
+        return sum(len(buckets) for _, buckets in self._shards)
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteRateLimitStore:
+    """
+    Buckets compartidos entre procesos (varios workers de uvicorn) en un
+    archivo SQLite.
+
+    Cada comprobación es un único UPSERT ... RETURNING que recarga y consume
+    el token de forma atómica, ejecutado en un thread para no bloquear el
+    event loop si otro worker tiene el lock de escritura. Los datos no
+    necesitan durabilidad: se usa WAL con synchronous=OFF.
+
+    La conexión se abre en el primer uso dentro de cada proceso, así que el
+    store es seguro con workers creados por fork (modo --preload).
+    """
+
+    # Cada cuántas comprobaciones se borran los buckets ya recargados del todo
+    PURGE_EVERY = 1024
+
+    _REFILLED = "min(:capacity, tokens + max(:now - updated_at, 0) * :rate)"
+    _UPSERT = f"""
+        INSERT INTO rate_limits (key, tokens, updated_at, allowed)
+        VALUES (:key, :capacity - 1, :now, 1)
+        ON CONFLICT(key) DO UPDATE SET
+            tokens = CASE WHEN {_REFILLED} >= 1 THEN {_REFILLED} - 1 ELSE {_REFILLED} END,
+            allowed = {_REFILLED} >= 1,
+            updated_at = :now
+        RETURNING tokens, allowed
+    """
+    _REFUND = "UPDATE rate_limits SET tokens = min(:capacity, tokens + 1) WHERE key = :key"
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._max_period = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexión del proceso actual (se llama con el lock tomado)."""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            self._pid = os.getpid()
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+                "updated_at REAL NOT NULL, allowed INTEGER NOT NULL) WITHOUT ROWID"
+            )
+        return self._conn
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        return await asyncio.to_thread(self._hit, key, policy)
+
+    def _hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        # Reloj de pared: los workers no comparten time.monotonic()
+        now = time.time()
+        params = {"key": key, "capacity": policy.capacity, "rate": policy.refill_rate, "now": now}
+        with self._lock:
+            conn = self._connection()
+            tokens, allowed = conn.execute(self._UPSERT, params).fetchone()
+            self._hits += 1
+            self._max_period = max(self._max_period, policy.period)
+            if self._hits % self.PURGE_EVERY == 0:
+                conn.execute(
+                    "DELETE FROM rate_limits WHERE updated_at < ?", (now - self._max_period,)
+                )
+        if allowed:
+            return RateLimitResult(True, tokens, 0.0)
+        return RateLimitResult(False, tokens, (1 - tokens) / policy.refill_rate)
+
+    async def refund(self, key: str, policy: RateLimitPolicy) -> None:
+        await asyncio.to_thread(self._refund, key, policy)
+
+    def _refund(self, key: str, policy: RateLimitPolicy) -> None:
+        with self._lock:
+            self._connection().execute(self._REFUND, {"key": key, "capacity": policy.capacity})
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT count(*) FROM rate_limits").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+class RateLimiter:
+    """Aplica políticas de rate limit sobre un store y lleva contadores para /metrics."""
+
+    def __init__(self, store, enabled: bool = True):
+        self.store = store
+        self.enabled = enabled
+        self.allowed = 0
+        self.rejected = 0
+
+    async def check(self, policy: Optional[RateLimitPolicy], *identities: str) -> None:
+        """Consume un token del bucket de cada identidad para la política.
+
+        Si un bucket está vacío se devuelven los tokens ya consumidos de los
+        anteriores: un request rechazado no gasta el límite de ninguna
+        identidad (p. ej. la IP de un usuario cuyo username está bloqueado).
+
+        Raises:
+            HTTPException: 429 con Retry-After si algún bucket está vacío.
+        """
+        if not self.enabled or policy is None:
+            return
+        consumed: List[str] = []
+        for identity in identities:
+            key = f"{policy.name}:{identity}"
+            result = await self.store.hit(key, policy)
+            if not result.allowed:
+                break
+            consumed.append(key)
+        else:
+            self.allowed += 1
+            return
+        for key in consumed:
+            await self.store.refund(key, policy)
+        self.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiadas solicitudes, intente nuevamente más tarde",
+            headers={"Retry-After": str(max(1, math.ceil(result.retry_after)))},
+        )
+
+    def close(self) -> None:
+        """Libera los recursos del store (la conexión SQLite, si la hay)."""
+        self.store.close()
+
+    def stats(self) -> dict:
+        """Devuelve el número de buckets y los contadores de admitidos y rechazados."""
+        return {
+            "keys": self.store.size(),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+def _build_store():
+    if settings.RATE_LIMIT_SQLITE_PATH:
+        return SQLiteRateLimitStore(settings.RATE_LIMIT_SQLITE_PATH)
+    return MemoryRateLimitStore(
+        shards=settings.RATE_LIMIT_SHARDS,
+        max_keys=settings.RATE_LIMIT_MAX_KEYS
+    )
+
+
+rate_limiter = RateLimiter(_build_store(), enabled=settings.RATE_LIMIT_ENABLED)
+
+login_policy = RateLimitPolicy.parse("login", settings.RATE_LIMIT_LOGIN)
+register_policy = RateLimitPolicy.parse("register", settings.RATE_LIMIT_REGISTER)
+write_policy = RateLimitPolicy.parse("write", settings.RATE_LIMIT_WRITE)
+
+
+def client_ip(request: Request) -> str:
+    """IP del cliente (detrás de un proxy, usar uvicorn --proxy-headers)."""
+    return request.client.host if request.client else "unknown"
+
+
+def _principal(request: Request) -> str:
+    """Usuario del token Bearer si es válido; si no, la IP del cliente."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = verify_access_token(token)
+        if payload and payload.get("sub") is not None:
+            return f"user:{payload['sub']}"
+    return f"ip:{client_ip(request)}"
+
+
+async def limit_writes(request: Request) -> None:
+    """
+    Dependencia de router: limita los POST/PUT/PATCH/DELETE por usuario
+    (o por IP si no hay token). Los GET no consumen tokens.
+    """
+    if request.method in WRITE_METHODS:
+        await rate_limiter.check(write_policy, _principal(request))
+
+
+async def limit_register(request: Request) -> None:
+    """Limita los registros por IP antes de calcular el hash bcrypt."""
+    await rate_limiter.check(register_policy, f"ip:{client_ip(request)}")
+
+
+async def limit_login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends()
+) -> None:
+    """
+    Limita los intentos de login por IP y por username antes de verificar
+    la contraseña con bcrypt. El formulario se comparte con el endpoint
+    (FastAPI cachea la dependencia dentro del request).
+    """
+    await rate_limiter.check(
+        login_policy, f"ip:{client_ip(request)}", f"username:{form_data.username.lower()}"
+    )
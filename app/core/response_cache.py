@@ -0,0 +1,222 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+
+@dataclass
+class CachedResponse:
+    """Respuesta serializada guardada en el cache."""
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    dependencies: Tuple[str, ...] = ()
+    expires_at: float = 0.0
+
+
+def make_etag(body: bytes) -> str:
+    """Genera un ETag fuerte a partir del contenido de la respuesta."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compara el header If-None-Match con el ETag actual (comparación débil)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Cache de respuestas JSON ya serializadas, con ETag y desalojo LRU.
+
+    Cada entrada declara de qué entidades depende (por ejemplo "post:5",
+    "user:2" o "tags"), y los handlers de escritura invalidan solo las
+    entradas de la entidad que modifican. El cache es por proceso: con
+    varios workers la invalidación es local y el TTL acota lo obsoleto.
+
+    Cada invalidación avanza un contador de generación y recuerda en qué
+    generación se invalidó cada dependencia. Quien construye una respuesta
+    lee la generación antes de consultar la BD y la pasa a set(): si alguna
+    de sus dependencias se invalidó mientras tanto, el cuerpo puede ser
+    anterior a esa escritura y no se guarda.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._data: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._dependents: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.stale_skips = 0
+        self._generation = 0
+        # Dependencia -> generación de su última invalidación (acotado a
+        # max_size entradas; las olvidadas se cubren con _forgotten_generation)
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._forgotten_generation = 0
+
+    def generation(self) -> int:
+        """Generación actual; se lee antes de construir una respuesta para set()."""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(
+        self,
+        key: Hashable,
+        body: bytes,
+        dependencies: Iterable[str],
+        headers: Optional[Dict[str, str]] = None,
+        generation: Optional[int] = None
+    ) -> CachedResponse:
+        """Guarda una respuesta y la devuelve como CachedResponse.
+
+        Args:
+            generation (Optional[int]): Valor de generation() leído antes de
+                construir el cuerpo. Si alguna dependencia se invalidó después,
+                la respuesta se devuelve pero no se guarda.
+        """
+        entry = CachedResponse(
+            body=body,
+            etag=make_etag(body),
+            headers=headers or {},
+            dependencies=tuple(dependencies),
+            expires_at=time.monotonic() + self.ttl
+        )
+        if self.max_size <= 0:
+            return entry
+
+        with self._lock:
+            if generation is not None and self._invalidated_since(entry.dependencies, generation):
+                self.stale_skips += 1
+                return entry
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = entry
+            self.bytes += len(body)
+            for dependency in entry.dependencies:
+                self._dependents.setdefault(dependency, set()).add(key)
+            while len(self._data) > self.max_size:
+                self._remove(next(iter(self._data)))
+        return entry
+
+    def invalidate(self, *dependencies: str) -> None:
+        """Elimina todas las entradas que dependen de alguna de las entidades dadas."""
+        with self._lock:
+            self._generation += 1
+            for dependency in dependencies:
+                for key in self._dependents.pop(dependency, set()):
+                    self._remove(key)
+                self._invalidated[dependency] = self._generation
+                self._invalidated.move_to_end(dependency)
+            while len(self._invalidated) > max(self.max_size, 1):
+                _, self._forgotten_generation = self._invalidated.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._dependents.clear()
+            self.bytes = 0
+            # Equivale a invalidar todas las dependencias
+            self._generation += 1
+            self._invalidated.clear()
+            self._forgotten_generation = self._generation
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "stale_skips": self.stale_skips,
+            }
+
+    def _invalidated_since(self, dependencies: Iterable[str], generation: int) -> bool:
+        """Indica si alguna dependencia se invalidó después de `generation` (con el lock tomado)."""
+        if generation < self._forgotten_generation:
+            return True
+        return any(self._invalidated.get(dependency, 0) > generation for dependency in dependencies)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= len(entry.body)
+        for dependency in entry.dependencies:
+            keys = self._dependents.get(dependency)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[dependency]
+
+
+response_cache = ResponseCache(
+    max_size=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+)
+
+
+async def cached_json_response(
+    request: Request,
+    key: Hashable,
+    build: Callable[[], Awaitable[Tuple[bytes, Iterable[str], Dict[str, str]]]]
+) -> Response:
+    """Devuelve la respuesta desde el cache o la construye y la guarda.
+
+    Responde 304 si el If-None-Match del cliente coincide con el ETag. Si
+    una escritura invalida alguna dependencia mientras se ejecuta `build`,
+    la respuesta se envía pero no se guarda.
+
+    Args:
+        request (Request): Request actual.
+        key (Hashable): Clave de la ruta y sus parámetros.
+        build: Corrutina que consulta la BD y devuelve (body, dependencias, headers).
+            Puede lanzar HTTPException, en cuyo caso no se guarda nada.
+
+    Returns:
+        Response: Respuesta JSON con ETag, o 304 sin cuerpo.
+    """
+    entry = response_cache.get(key)
+    cache_status = "HIT"
+    if entry is None:
+        cache_status = "MISS"
+        generation = response_cache.generation()
+        body, dependencies, headers = await build()
+        entry = response_cache.set(key, body, dependencies, headers, generation=generation)
+
+    headers = {**entry.headers, "ETag": entry.etag, "X-Cache": cache_status}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=entry.body, media_type="application/json", headers=headers)
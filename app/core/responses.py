@@ -0,0 +1,75 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # está en requirements.txt; sin él se usa json de la stdlib
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Respuesta JSON por defecto de la aplicación: serializa con orjson si
+    está instalado y, si no, con el json de la stdlib como JSONResponse.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    """TypeAdapter cacheado por tipo (construirlo compila el validador y es caro)."""
+    return TypeAdapter(schema)
+
+
+def serialize(schema: Any, data: Any) -> bytes:
+    """Valida `data` (objetos ORM o dicts) contra `schema` y lo serializa a JSON.
+
+    Pydantic valida y serializa directamente a bytes, sin pasar por
+    diccionarios intermedios ni por jsonable_encoder.
+
+    Args:
+        schema (Any): Esquema de respuesta, p. ej. PostResponse o List[PostResponse].
+        data (Any): Datos a serializar; se leen por atributos.
+
+    Returns:
+        bytes: Cuerpo JSON.
+    """
+    adapter = type_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def model_response(
+    schema: Any,
+    data: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Respuesta JSON serializada con `serialize`.
+
+    Para usar en handlers con listados o relaciones anidadas. El handler
+    mantiene su `response_model` para la documentación de OpenAPI; al
+    devolver un Response, FastAPI no vuelve a validar ni a serializar.
+
+    Args:
+        schema (Any): Esquema de respuesta.
+        data (Any): Datos a serializar.
+        status_code (int): Código de estado.
+        headers (Optional[Dict[str, str]]): Headers adicionales.
+
+    Returns:
+        Response: Respuesta application/json.
+    """
+    return Response(
+        content=serialize(schema, data),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
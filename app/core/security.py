@@ -1,8 +1,15 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 import bcrypt
 from app.core.config import settings
+from app.core.cache import TTLCache
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica si la contraseña proporcionada coincide con la contraseña hasheada almacenada.
@@ -32,6 +39,128 @@ def get_password_hash(password: str) -> str:
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
+class HashingPool:
+    """
+    Pool de threads dedicado a bcrypt para no bloquear el event loop.
+
+    bcrypt libera el GIL mientras calcula, así que los threads permiten
+    hashear en paralelo. El número de tareas en espera está acotado: cuando
+    el pool está saturado se rechaza la petición con 503 en lugar de
+    acumular latencia para todos los clientes.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        """
+        Args:
+            workers (int): Número de threads que ejecutan bcrypt.
+            queue_limit (int): Máximo de tareas esperando un thread libre.
+        """
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def _record(self, queue_wait: float, hash_time: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            self.hash_time_total += hash_time
+            self.hash_time_max = max(self.hash_time_max, hash_time)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Ejecuta `func(*args)` en el pool y espera el resultado.
+
+        Raises:
+            HTTPException: 503 si el pool y su cola están llenos.
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Servidor ocupado, intente nuevamente",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def task() -> Any:
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self._record(started - submitted, time.perf_counter() - started)
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, task)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict:
+        """Devuelve las métricas de uso del pool."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_avg": self.queue_wait_total / self.completed if self.completed else 0.0,
+                "queue_wait_max": self.queue_wait_max,
+                "hash_time_avg": self.hash_time_total / self.completed if self.completed else 0.0,
+                "hash_time_max": self.hash_time_max,
+            }
+
+    def shutdown(self) -> None:
+        """Espera las tareas en curso y detiene los threads del pool.
+
+        El pool sigue siendo utilizable: los threads se vuelven a crear al
+        enviar la siguiente tarea.
+        """
+        executor = self._executor
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        executor.shutdown(wait=True)
+
+
+hashing_pool = HashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT
+)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versión asíncrona de verify_password que se ejecuta en el pool de bcrypt.
+
+    Args:
+        plain_password (str): Contraseña en texto plano proporcionada por el usuario.
+        hashed_password (str): Contraseña hasheada almacenada en la base de datos.
+
+    Returns:
+        bool: True si las contraseñas coinciden, False en caso contrario.
+    """
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Versión asíncrona de get_password_hash que se ejecuta en el pool de bcrypt.
+
+    Args:
+        password (str): Contraseña en texto plano.
+
+    Returns:
+        str: Contraseña hasheada.
+    """
+    return await hashing_pool.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Crea un token de acceso JWT con la información proporcionada y una fecha de expiración opcional.
 
@@ -52,19 +181,61 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     
     return encoded_jwt
 
+# Cache de tokens ya verificados: digest del token -> payload.
+# Cada entrada expira junto con el `exp` del token.
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+_token_cache_key_id: Optional[bytes] = None
+_token_cache_lock = threading.Lock()
+
+def _signing_key_id() -> bytes:
+    """Huella de la clave y el algoritmo con los que se firman los tokens."""
+    return hashlib.sha256(f"{settings.ALGORITHM}:{settings.SECRET_KEY}".encode("utf-8")).digest()
+
+def clear_token_cache() -> None:
+    """Vacía el cache de tokens verificados (por ejemplo al rotar SECRET_KEY)."""
+    token_cache.clear()
+
+def _current_key_id() -> bytes:
+    """Devuelve la huella de la clave actual y vacía el cache si la clave cambió."""
+    global _token_cache_key_id
+    key_id = _signing_key_id()
+    if key_id != _token_cache_key_id:
+        with _token_cache_lock:
+            if key_id != _token_cache_key_id:
+                clear_token_cache()
+                _token_cache_key_id = key_id
+    return key_id
+
 def verify_access_token(token: str) -> Optional[dict]:
     """Verifica la validez del token de acceso JWT y decodifica su contenido.
 
+    Los tokens válidos se guardan en cache hasta su expiración, de modo que
+    las peticiones repetidas con el mismo token no recalculan la firma.
+
     Args:
         token (str): Token JWT a verificar.
     
     Returns:
         Optional[dict]: Payload decodificado si el token es válido, None en caso contrario.
     """
+    key_id = _current_key_id()
+    cache_key = (key_id, hashlib.sha256(token.encode("utf-8")).digest())
+    cached = token_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+    
     try:
         
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(cache_key, dict(payload), ttl=exp - time.time())
+    
+    return payload
\ No newline at end of file
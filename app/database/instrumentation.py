@@ -0,0 +1,96 @@
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Clave en connection.info con los instantes de inicio de las sentencias en curso
+_START_KEY = "query_start_ns"
+
+
+@dataclass
+class QueryStats:
+    """Sentencias SQL ejecutadas durante un request."""
+    count: int = 0
+    duration: float = 0.0
+    statements: Dict[str, int] = field(default_factory=dict)
+    # El request repite consultas por lotes a propósito (p. ej. un export):
+    # no se avisa de N+1 ni de exceso de consultas
+    batched: bool = False
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Sentencias ejecutadas al menos `threshold` veces (posible N+1)."""
+        return [
+            (statement, count) for statement, count in self.statements.items()
+            if count >= threshold
+        ]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> Tuple[QueryStats, Token]:
+    """Empieza a contar las sentencias del contexto actual (un request).
+
+    Returns:
+        Tuple[QueryStats, Token]: Estadísticas y token para stop_query_stats.
+    """
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_query_stats(token: Token) -> None:
+    _current_stats.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def mark_batched_queries() -> None:
+    """Indica que el request actual ejecuta consultas por lotes de forma intencionada."""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.batched = True
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter_ns())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _finish(conn, statement)
+
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None:
+        _finish(exception_context.connection, exception_context.statement or "")
+
+
+def _finish(conn, statement: str) -> None:
+    stats = _current_stats.get()
+    starts = conn.info.get(_START_KEY)
+    if stats is None or not starts:
+        return
+    stats.record(statement, (time.perf_counter_ns() - starts.pop()) / 1e9)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Registra los eventos que cuentan sentencias y tiempo de BD por request.
+
+    Fuera de un request (comandos, migraciones) los eventos no hacen nada.
+    """
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
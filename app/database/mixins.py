@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Boolean
+from sqlalchemy import Column, DateTime, Boolean, Index, text
 from sqlalchemy.ext.declarative import declared_attr
 
 class TimestampMixin:
@@ -20,4 +20,17 @@ class SoftDeleteMixin:
     """
     @declared_attr
     def is_deleted(cls):
-        return Column(Boolean, default=False, nullable=False)
\ No newline at end of file
+        return Column(Boolean, default=False, nullable=False)
+
+
+def live_index(name: str, *columns: str) -> Index:
+    """
+    Índice parcial que solo incluye las filas no borradas (is_deleted = 0),
+    para las consultas que filtran por SoftDeleteMixin
+    """
+    return Index(
+        name,
+        *columns,
+        sqlite_where=text("is_deleted = 0"),
+        postgresql_where=text("NOT is_deleted")
+    )
@@ -1,12 +1,93 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.database.instrumentation import instrument_engine
 
-engine = create_async_engine(
-    settings.DATABASE_URL, 
-    echo=True,
-    connect_args={"check_same_thread": False}
-)
+
+def _is_memory_sqlite(url) -> bool:
+    return url.database in (None, "", ":memory:")
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configura cada conexión SQLite nueva con los PRAGMAs del perfil."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
+
+def _apply_sqlite_read_only(dbapi_connection, connection_record) -> None:
+    """Marca la conexión como de solo lectura."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def build_engine(database_url: str, read_only: bool = False) -> AsyncEngine:
+    """Crea un engine asíncrono con el perfil definido en la configuración.
+
+    En SQLite sobre archivo se usa un pool de conexiones (el default de
+    aiosqlite es NullPool, que abre una conexión por sesión) y se aplican
+    los PRAGMAs de WAL, synchronous, mmap, cache y busy_timeout.
+
+    Args:
+        database_url (str): URL de conexión.
+        read_only (bool): En SQLite, abre las conexiones con query_only.
+
+    Returns:
+        AsyncEngine: Engine configurado.
+    """
+    url = make_url(database_url)
+    profile = settings.engine_profile()
+    kwargs = {"echo": profile.pop("echo")}
+
+    if url.get_backend_name() == "sqlite":
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if not _is_memory_sqlite(url):
+            kwargs["poolclass"] = AsyncAdaptedQueuePool
+            kwargs.update(profile)
+    else:
+        kwargs.update(profile)
+
+    new_engine = create_async_engine(url, **kwargs)
+
+    if url.get_backend_name() == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        if read_only:
+            event.listen(new_engine.sync_engine, "connect", _apply_sqlite_read_only)
+
+    # Conteo de sentencias y tiempo de BD por request (headers X-DB-*)
+    instrument_engine(new_engine)
+
+    return new_engine
+
+
+def build_read_engine(write_engine: AsyncEngine) -> AsyncEngine:
+    """Crea el engine usado por las rutas de lectura.
+
+    Usa READ_DATABASE_URL (una réplica) si está configurada. Si no, en SQLite
+    sobre archivo abre un pool separado de conexiones de solo lectura sobre
+    el mismo archivo, que en modo WAL leen en paralelo sin bloquear las
+    escrituras. En cualquier otro caso reutiliza el engine de escritura.
+    """
+    if settings.READ_DATABASE_URL:
+        return build_engine(settings.READ_DATABASE_URL, read_only=True)
+
+    url = write_engine.url
+    if url.get_backend_name() == "sqlite" and not _is_memory_sqlite(url):
+        return build_engine(settings.DATABASE_URL, read_only=True)
+
+    return write_engine
+
+
+engine = build_engine(settings.DATABASE_URL)
+read_engine = build_read_engine(engine)
 
 AsyncSessionLocal = sessionmaker(
     engine,
@@ -14,6 +95,18 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+AsyncReadSessionLocal = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_read_db():
+    """Sesión para rutas GET, respaldada por el engine de lectura."""
+    async with AsyncReadSessionLocal() as session:
+        yield session
@@ -0,0 +1,26 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import Table, insert
+from sqlalchemy.sql.dml import Insert
+
+
+def insert_ignore(table: Table, dialect_name: str, index_elements: Optional[Sequence[str]] = None) -> Insert:
+    """Construye un INSERT que ignora las filas que violan una restricción única.
+
+    Args:
+        table (Table): Tabla destino.
+        dialect_name (str): Nombre del dialecto de la sesión (sqlite, postgresql, mysql...).
+        index_elements (Optional[Sequence[str]]): Columnas del conflicto (SQLite/PostgreSQL).
+
+    Returns:
+        Insert: INSERT ... ON CONFLICT DO NOTHING (o INSERT IGNORE en MySQL).
+    """
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=index_elements)
+
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table).on_conflict_do_nothing(index_elements=index_elements)
+
+    return insert(table).prefix_with("IGNORE")
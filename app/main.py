@@ -2,15 +2,22 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # routers
-from app.routers import auth, users, posts,comments,tags
+from app.routers import auth, users, posts,comments,tags, metrics, health
 
 # importar middleware 
 from app.middleware.logging import ResponseTimeMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.responses import FastJSONResponse
+from app.core.lifespan import lifespan
 
 app = FastAPI(
     title="Blog Random",
     description="Blog Random para el Challenge (API)",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 
@@ -20,6 +27,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "X-Cache", "X-DB-Queries", "X-DB-Time", "Retry-After",
+                    comments.THREAD_TRUNCATED_HEADER],
+)
+
+# Compresión de respuestas grandes; queda dentro del middleware de logging
+# para que el tiempo y el tamaño registrados incluyan la compresión
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
 )
 
 # Agrega middleware de logging de tiempo de respuesta
@@ -31,6 +50,8 @@ app.include_router(users.router)
 app.include_router(posts.router)
 app.include_router(comments.router)
 app.include_router(tags.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
 
 @app.get("/")
 async def root():
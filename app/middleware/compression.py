@@ -0,0 +1,269 @@
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # está en requirements.txt; sin él solo se negocian gzip y zstd
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard es opcional (pip install zstandard para activar zstd)
+    zstandard = None
+
+# Tipos de contenido que vale la pena comprimir (JSON, NDJSON y texto)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript")
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits=31: formato gzip (cabecera y CRC) en lugar de zlib crudo
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Codificaciones soportadas, en orden de preferencia del servidor."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """Elige la codificación según el header Accept-Encoding del cliente.
+
+    Gana el mayor q-value; en caso de empate, la preferencia del servidor
+    (el orden de `available`). Cacheado: los clientes repiten el mismo header.
+
+    Args:
+        accept_encoding (str): Valor del header Accept-Encoding.
+        available (Tuple[str, ...]): Codificaciones soportadas por orden de preferencia.
+
+    Returns:
+        Optional[str]: Codificación elegida, o None para enviar sin comprimir.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith("+json")
+        or media_type in COMPRESSIBLE_TYPES
+    )
+
+
+def _may_compress(message: Message) -> bool:
+    """Indica si el middleware comprimiría la respuesta con un cuerpo suficientemente grande."""
+    headers = Headers(raw=message.get("headers", []))
+    status_code = message["status"]
+    return not (
+        status_code < 200 or status_code in (204, 304)
+        or "content-encoding" in headers
+        or not is_compressible(headers.get("content-type", ""))
+    )
+
+
+def _add_vary(message: Message) -> None:
+    """Añade Vary: Accept-Encoding para que los caches compartidos separen las variantes."""
+    message["headers"] = list(message.get("headers", []))
+    MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime las respuestas con zstd, brotli o gzip
+    según el Accept-Encoding del cliente.
+
+    Solo comprime respuestas de texto/JSON de al menos `minimum_size` bytes:
+    las pequeñas, los 304 y las que ya traen Content-Encoding pasan tal cual.
+    Las respuestas en streaming se comprimen por chunks, con un flush tras
+    cada uno para que el cliente reciba los datos sin esperar al final.
+    Toda respuesta de texto/JSON lleva Vary: Accept-Encoding, también las
+    que salen sin comprimir. gzip está siempre disponible, brotli viene en
+    requirements.txt y zstd solo se ofrece si zstandard está instalado.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        encoding = negotiate_encoding(accept_encoding, self.encodings) if accept_encoding else None
+        if encoding is None:
+            async def send_with_vary(message: Message) -> None:
+                if message["type"] == "http.response.start" and _may_compress(message):
+                    _add_vary(message)
+                await send(message)
+
+            await self.app(scope, receive, send_with_vary)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def encoder(self, encoding: str):
+        if encoding == "zstd":
+            return _ZstdEncoder(self.zstd_level)
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressionResponder:
+    """Estado de compresión de una respuesta."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._passthrough = False
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._encoder = None
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            if not _may_compress(message):
+                self._passthrough = True
+                await self._send(message)
+            else:
+                # Se retiene hasta saber si el cuerpo alcanza el tamaño mínimo
+                self._start = message
+            return
+
+        if message_type != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._encoder is not None:
+            data = self._encoder.compress(body)
+            data += self._encoder.flush() if more_body else self._encoder.finish()
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        if body:
+            self._pending.append(body)
+            self._pending_size += len(body)
+        if more_body and self._pending_size < self.middleware.minimum_size:
+            return
+
+        body = b"".join(self._pending)
+        self._pending = []
+        if self._pending_size < self.middleware.minimum_size:
+            # Respuesta pequeña: sale sin comprimir, pero otra podría comprimirse
+            self._passthrough = True
+            _add_vary(self._start)
+            await self._send(self._start)
+            await self._send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+
+        self._encoder = self.middleware.encoder(self.encoding)
+        data = self._encoder.compress(body)
+        data += self._encoder.flush() if more_body else self._encoder.finish()
+
+        _add_vary(self._start)
+        headers = MutableHeaders(scope=self._start)
+        headers["content-encoding"] = self.encoding
+        if more_body:
+            del headers["content-length"]
+        else:
+            headers["content-length"] = str(len(data))
+        # La representación comprimida es otra: el ETag pasa a ser débil
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = "W/" + etag
+
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
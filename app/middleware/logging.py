@@ -1,8 +1,12 @@
 import time
 import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from typing import Dict
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.database.instrumentation import QueryStats, start_query_stats, stop_query_stats
 
 
 logging.basicConfig(
@@ -11,30 +15,101 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Etiqueta para requests que no coinciden con ninguna ruta (evita una
+# serie por cada path desconocido)
+UNMATCHED_ROUTE = "<unmatched>"
 
-class ResponseTimeMiddleware(BaseHTTPMiddleware):
+
+class ResponseTimeMiddleware:
     """
-    Middleware para registrar el tiempo de respuesta de cada request.
+    Middleware ASGI para registrar el tiempo de respuesta de cada request.
+
+    Implementado como ASGI puro (sin BaseHTTPMiddleware) para no crear
+    tareas ni streams extra por request. Añade los headers X-Process-Time,
+    X-DB-Queries y X-DB-Time, escribe una línea de log y alimenta las
+    métricas de /metrics. Avisa en el log de requests con demasiadas
+    sentencias SQL o con la misma sentencia repetida (posible N+1).
     """
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_templates: Dict[object, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # registrar el tiempo de inicio
-        start_time = time.time()
-        
-        # procesar la request
-        response = await call_next(request)
-        
-        # calcular el tiempo de respuesta
-        process_time = time.time() - start_time
-        
-        # Agrega el header con el tiempo de respuesta
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        # logging del request
-        logger.info(
-            f"Path: {request.method} {request.url.path} | "
-            f"Status: {response.status_code} | "
-            f"Duration: {process_time:.4f}s"
-        )
-        
-        return response
+        start_ns = time.perf_counter_ns()
+        status_code = 500
+        response_size = 0
+        query_stats, stats_token = start_query_stats()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = (time.perf_counter_ns() - start_ns) / 1e9
+                # Agrega el header con el tiempo de respuesta
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", str(process_time).encode("latin-1")))
+                headers.append((b"x-db-queries", str(query_stats.count).encode("latin-1")))
+                headers.append((b"x-db-time", str(query_stats.duration).encode("latin-1")))
+                message["headers"] = headers
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        metrics_registry.request_started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_query_stats(stats_token)
+            # calcular el tiempo de respuesta
+            process_time = (time.perf_counter_ns() - start_ns) / 1e9
+            route = self._route_template(scope)
+            metrics_registry.request_finished(
+                scope["method"], route, status_code, process_time, response_size
+            )
+
+            # logging del request
+            logger.info(
+                "Path: %s %s | Status: %s | Duration: %.4fs | DB: %d queries %.4fs",
+                scope["method"], scope["path"], status_code, process_time,
+                query_stats.count, query_stats.duration
+            )
+            self._warn_query_patterns(scope, route, query_stats)
+
+    def _warn_query_patterns(self, scope: Scope, route: str, stats: QueryStats) -> None:
+        """Registra un aviso si el request ejecutó demasiadas sentencias o repitió alguna."""
+        if stats.batched:
+            return
+        if stats.count > settings.DB_QUERY_WARN_THRESHOLD:
+            logger.warning(
+                "Demasiadas consultas SQL: %s %s ejecutó %d sentencias",
+                scope["method"], route, stats.count
+            )
+        for statement, count in stats.repeated(settings.DB_REPEATED_QUERY_THRESHOLD):
+            logger.warning(
+                "Posible N+1 en %s %s: sentencia repetida %d veces: %s",
+                scope["method"], route, count, " ".join(statement.split())[:200]
+            )
+
+    def _route_template(self, scope: Scope) -> str:
+        """Obtiene la plantilla de la ruta que atendió el request (p. ej. /posts/{post_id})."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+
+        template = self._route_templates.get(endpoint)
+        if template is None:
+            app = scope.get("app")
+            for route in getattr(app, "routes", []):
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = route.path
+                    break
+            else:
+                template = UNMATCHED_ROUTE
+            self._route_templates[endpoint] = template
+        return template
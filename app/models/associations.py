@@ -1,5 +1,5 @@
 
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from app.database.base import Base
 
 # Tabla intermedia para la relación muchos a muchos entre Post y Tag
@@ -7,5 +7,7 @@ post_tags = Table(
     'post_tags',
     Base.metadata,
     Column('post_id', Integer, ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True),
-    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True)
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    # Índice inverso para las búsquedas por tag
+    Index('ix_post_tags_tag_id_post_id', 'tag_id', 'post_id')
 )
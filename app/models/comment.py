@@ -1,24 +1,80 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from typing import Optional, Tuple
+
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 from app.database.mixins import TimestampMixin, SoftDeleteMixin
 
+# Cada segmento de la ruta es un id con ancho fijo, para que el orden
+# alfabético de las rutas sea el orden de los ids en cada nivel
+PATH_SEGMENT_WIDTH = 10
+PATH_SEPARATOR = "."
+
+
+def comment_path(comment_id: int, parent_path: Optional[str] = None) -> str:
+    """Ruta materializada de un comentario a partir de la de su padre.
+
+    Args:
+        comment_id (int): Id del comentario.
+        parent_path (Optional[str]): Ruta del padre, o None si es de primer nivel.
+
+    Returns:
+        str: Ruta, p. ej. "0000000001.0000000007".
+    """
+    segment = str(comment_id).zfill(PATH_SEGMENT_WIDTH)
+    return f"{parent_path}{PATH_SEPARATOR}{segment}" if parent_path else segment
+
+
+def subtree_range(path: str) -> Tuple[str, str]:
+    """Límites [inicio, fin) de las rutas de un comentario y todos sus descendientes.
+
+    Los descendientes empiezan por "<path>." y "/" es el carácter siguiente
+    a ".", así que el subárbol es un rango contiguo del índice (post_id, path).
+    """
+    return path, path + "/"
+
+
+def path_root_id(path: str) -> int:
+    """Id del comentario de primer nivel del hilo al que pertenece la ruta."""
+    return int(path[:PATH_SEGMENT_WIDTH])
+
+
 class Comment(Base, TimestampMixin, SoftDeleteMixin):
     """
     Clase que representa un comentario en una publicación.
 
+    Los comentarios forman hilos: `parent_id` apunta al comentario al que
+    responde y `path` guarda la ruta materializada desde el comentario de
+    primer nivel. Ordenar por (post_id, path) recorre los hilos en preorden.
+
     Args:
         Base (_type_): Clase base para todos los modelos de la base de datos.
         TimestampMixin (_type_): Annade campos de marca de tiempo.
         SoftDeleteMixin (_type_): Annade soporte para eliminación lógica.
     """
     __tablename__ = "comments"
-    
+    __table_args__ = (
+        # Hilos y subárboles: un rango de rutas dentro del post
+        Index("ix_comments_post_path", "post_id", "path"),
+        # Paginación de los comentarios de primer nivel de un post
+        Index(
+            "ix_comments_post_roots",
+            "post_id",
+            "id",
+            sqlite_where=text("parent_id IS NULL"),
+            postgresql_where=text("parent_id IS NULL")
+        ),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     content = Column(String, nullable=False)
-    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
+    # Se asigna justo después del INSERT, porque incluye el id del comentario
+    path = Column(String, nullable=True)
+    depth = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Relaciones
     post = relationship("Post", back_populates="comments")
-    author = relationship("User")
\ No newline at end of file
+    author = relationship("User")
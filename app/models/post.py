@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from app.database.base import Base
-from app.database.mixins import TimestampMixin, SoftDeleteMixin
+from app.database.mixins import TimestampMixin, SoftDeleteMixin, live_index
 from app.models.associations import post_tags
 
 class Post(Base,TimestampMixin,SoftDeleteMixin):
@@ -14,11 +14,16 @@ class Post(Base,TimestampMixin,SoftDeleteMixin):
         SoftDeleteMixin (_type_): Annade soporte para eliminación lógica.
     """
     __tablename__ = "posts"
+    __table_args__ = (
+        live_index("ix_posts_id_live", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), index=True, nullable=False)
     content = Column(Text, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Contador desnormalizado de comentarios no borrados
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relaciones
     author = relationship("User", back_populates="posts")
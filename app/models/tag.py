@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
 from app.database.base import Base
-from app.database.mixins import TimestampMixin, SoftDeleteMixin
+from app.database.mixins import TimestampMixin, SoftDeleteMixin, live_index
 from app.models.associations import post_tags
 
 class Tag(Base, TimestampMixin, SoftDeleteMixin):
@@ -14,9 +14,14 @@ class Tag(Base, TimestampMixin, SoftDeleteMixin):
         SoftDeleteMixin (_type_): Annade soporte para eliminación lógica.
     """
     __tablename__ = "tags"
+    __table_args__ = (
+        live_index("ix_tags_id_live", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), unique=True, index=True, nullable=False)
+    # Contador desnormalizado de posts no borrados con este tag
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relación N:M con Post
     posts = relationship("Post", secondary=post_tags, back_populates="tags")
\ No newline at end of file
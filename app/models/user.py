@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, Boolean
 from sqlalchemy.orm import relationship
 from app.database.base import Base
-from app.database.mixins import TimestampMixin, SoftDeleteMixin
+from app.database.mixins import TimestampMixin, SoftDeleteMixin, live_index
 
 class User(Base, TimestampMixin, SoftDeleteMixin):
     """
@@ -13,12 +13,17 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
         SoftDeleteMixin (_type_): Annade soporte para eliminación lógica.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        live_index("ix_users_id_live", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index = True)
     email = Column(String, unique =  True, index=True,nullable=False)
     username = Column(String, unique=True,index=True,nullable = False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    # Contador desnormalizado de posts no borrados
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relación con otros modelos (Posts)
     posts = relationship("Post", back_populates="author",cascade="all, delete-orphan")
\ No newline at end of file
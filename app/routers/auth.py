@@ -8,12 +8,18 @@ from app.database.session import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.token import Token
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token
 from app.core.config import settings
+from app.core.rate_limit import limit_login, limit_register
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_register)]
+)
 async def register(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_db)
@@ -41,7 +47,7 @@ async def register(
     new_user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password)
+        hashed_password=await get_password_hash_async(user_data.password)
     )
     
     db.add(new_user)
@@ -50,7 +56,7 @@ async def register(
     
     return new_user
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_login)])
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
@@ -73,7 +79,7 @@ async def login(
     user = result.scalar_one_or_none()
     
     # Verificar usuario y contraseña
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario o contraseña incorrectos",
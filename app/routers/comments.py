@@ -1,17 +1,126 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Dict, List, Optional, Sequence
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, Select, bindparam, insert, select, update
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.database.session import get_db
-from app.models.comment import Comment
+from app.database.session import get_db, get_read_db
+from app.models.comment import Comment, comment_path, path_root_id, subtree_range
 from app.models.post import Post
 from app.models.user import User
 from app.schemas.comment import CommentCreate, CommentUpdate, CommentResponse
 from app.core.dependencies import get_current_active_user
+from app.core.rate_limit import limit_writes
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, paginate, next_cursor_headers
+from app.core.responses import model_response
+from app.core.response_cache import response_cache
+from app.core.bulk import validate_bulk_items, raise_if_nothing_valid
+from app.schemas.bulk import BulkCreateRequest, BulkCreateResponse, BulkItemError
+from app.core.config import settings
 
-router = APIRouter(prefix="/comments", tags=["Comments"])
+router = APIRouter(prefix="/comments", tags=["Comments"], dependencies=[Depends(limit_writes)])
+
+# Header que indica que un hilo se cortó en COMMENT_THREAD_MAX_ITEMS comentarios
+THREAD_TRUNCATED_HEADER = "X-Thread-Truncated"
+
+
+async def _add_comment_count(db: AsyncSession, post_id: int, delta: int) -> None:
+    """Actualiza posts.comment_count en la transacción actual."""
+    await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(comment_count=Post.comment_count + delta, updated_at=Post.updated_at)
+    )
+
+
+def _parent_error(parent: Optional[Row], post_id: int) -> Optional[str]:
+    """Motivo por el que no se puede responder a `parent` en el post, o None si se puede."""
+    if parent is None:
+        return "Comentario padre no encontrado"
+    if parent.post_id != post_id:
+        return "El comentario padre pertenece a otro post"
+    if parent.depth + 1 > settings.COMMENT_MAX_DEPTH:
+        return "Se alcanzó la profundidad máxima de respuestas"
+    return None
+
+
+def _comments_by_post_query(post_id: int) -> Select:
+    """Comentarios no borrados del post con su autor, sin paginar (ver paginate)."""
+    return (
+        select(Comment)
+        .options(selectinload(Comment.author))
+        .where(Comment.post_id == post_id, Comment.is_deleted == False)
+    )
+
+
+def _thread_roots_query(post_id: int) -> Select:
+    """Comentarios de primer nivel del post (id y ruta), sin paginar."""
+    return select(Comment.id, Comment.path).where(
+        Comment.post_id == post_id, Comment.parent_id.is_(None), Comment.is_deleted == False
+    )
+
+
+def _thread_query(post_id: int, start: str, end: str, max_depth: Optional[int]) -> Select:
+    """Comentarios no borrados de un rango de rutas del post, en preorden.
+
+    Es un único recorrido por rango del índice (post_id, path); el autor se
+    trae en la misma consulta con un JOIN por clave primaria.
+    """
+    stmt = (
+        select(Comment)
+        .options(joinedload(Comment.author, innerjoin=True))
+        .where(
+            Comment.post_id == post_id,
+            Comment.path >= start,
+            Comment.path < end,
+            Comment.is_deleted == False
+        )
+        .order_by(Comment.path)
+        .limit(settings.COMMENT_THREAD_MAX_ITEMS + 1)
+    )
+    if max_depth is not None:
+        stmt = stmt.where(Comment.depth <= max_depth)
+    return stmt
+
+
+def _thread_response(comments: Sequence[Comment], headers: Dict[str, str]) -> Response:
+    """Serializa un hilo y lo corta en COMMENT_THREAD_MAX_ITEMS comentarios."""
+    if len(comments) > settings.COMMENT_THREAD_MAX_ITEMS:
+        comments = comments[:settings.COMMENT_THREAD_MAX_ITEMS]
+        headers = {**headers, THREAD_TRUNCATED_HEADER: "true"}
+    return model_response(List[CommentResponse], comments, headers=headers)
+
+
+def _threads_page_response(comments: Sequence[Comment], roots: Sequence[Row], limit: int) -> Response:
+    """Serializa una página de hilos cortándola en el último hilo que cabe entero.
+
+    Si los hilos superan COMMENT_THREAD_MAX_ITEMS, la página termina antes
+    del primero que no cabe y el cursor apunta a él, así que la siguiente
+    página empieza por ese hilo completo. Si ni siquiera el primero cabe,
+    se devuelve cortado con X-Thread-Truncated y el cursor pasa al
+    siguiente: el resto de ese hilo se lee con /comments/{id}/thread.
+    """
+    if len(comments) <= settings.COMMENT_THREAD_MAX_ITEMS:
+        return model_response(List[CommentResponse], comments, headers=next_cursor_headers(roots, limit))
+    
+    cut_root_id = path_root_id(comments[settings.COMMENT_THREAD_MAX_ITEMS].path)
+    complete = 0
+    while path_root_id(comments[complete].path) != cut_root_id:
+        complete += 1
+    if complete:
+        return model_response(
+            List[CommentResponse],
+            comments[:complete],
+            headers={NEXT_CURSOR_HEADER: encode_cursor(path_root_id(comments[complete - 1].path))}
+        )
+    
+    headers = {THREAD_TRUNCATED_HEADER: "true"}
+    if cut_root_id != roots[-1].id or len(roots) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(cut_root_id)
+    return model_response(
+        List[CommentResponse], comments[:settings.COMMENT_THREAD_MAX_ITEMS], headers=headers
+    )
 
 
 @router.post("/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
@@ -25,39 +134,161 @@ async def create_comment(
     
     - **content**: Contenido del comentario (1-500 caracteres)
     - **post_id**: ID del post al que pertenece el comentario
+    - **parent_id**: ID del comentario al que responde (opcional, del mismo post)
     """
-    # Verificar que el post existe
+    # Incrementar el contador del post comprueba a la vez que existe y no
+    # está borrado, sin un SELECT previo. Es la primera escritura: bloquea
+    # la fila del post (en SQLite, la base) hasta el commit, igual que
+    # delete_comment, así que un borrado del subárbol del padre no puede
+    # confirmarse entre la comprobación del padre y el INSERT
     result = await db.execute(
-        select(Post).where(Post.id == comment_data.post_id, Post.is_deleted == False)
+        update(Post)
+        .where(Post.id == comment_data.post_id, Post.is_deleted == False)
+        .values(comment_count=Post.comment_count + 1, updated_at=Post.updated_at)
+        .returning(Post.id)
     )
-    post = result.scalar_one_or_none()
     
-    if not post:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post no encontrado"
         )
     
+    parent = None
+    if comment_data.parent_id is not None:
+        result = await db.execute(
+            select(Comment.post_id, Comment.path, Comment.depth)
+            .where(Comment.id == comment_data.parent_id, Comment.is_deleted == False)
+        )
+        parent = result.one_or_none()
+        error = _parent_error(parent, comment_data.post_id)
+        if error:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND if parent is None else status.HTTP_400_BAD_REQUEST,
+                detail=error
+            )
+    
     # Crear el comentario
     new_comment = Comment(
         content=comment_data.content,
         post_id=comment_data.post_id,
-        user_id=current_user.id
+        user_id=current_user.id,
+        parent_id=comment_data.parent_id,
+        depth=parent.depth + 1 if parent else 0
     )
     
     db.add(new_comment)
+    # La ruta termina con el id del comentario: se asigna tras el INSERT
+    await db.flush()
+    new_comment.path = comment_path(new_comment.id, parent.path if parent else None)
     await db.commit()
-    await db.refresh(new_comment)
+    response_cache.invalidate(f"post:{new_comment.post_id}")
+    
+    # El autor es el usuario actual, ya cargado en la sesión
+    set_committed_value(new_comment, "author", current_user)
+    
+    return new_comment
+
+
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_comments_bulk(
+    payload: BulkCreateRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Crear varios comentarios en una sola transacción
+    
+    - **items**: Lista de comentarios con `content`, `post_id` y opcionalmente `parent_id`
+    
+    Los posts y los comentarios padre se verifican con una consulta cada
+    uno; los elementos inválidos, de posts inexistentes o con un padre no
+    válido se informan en `errors` con su índice.
+    """
+    valid, errors = validate_bulk_items(payload, CommentCreate)
+    
+    # Los posts se comprueban con un UPDATE sin cambios que bloquea sus filas
+    # (en SQLite, la base) antes de leer los padres, como en create_comment
+    posts_table = Post.__table__
+    post_ids = {item.post_id for _, item in valid}
+    existing_post_ids = set()
+    if post_ids:
+        result = await db.execute(
+            update(posts_table)
+            .where(posts_table.c.id.in_(post_ids), posts_table.c.is_deleted == False)
+            .values(updated_at=posts_table.c.updated_at)
+            .returning(posts_table.c.id)
+        )
+        existing_post_ids = set(result.scalars().all())
+    
+    parent_ids = {item.parent_id for _, item in valid if item.parent_id is not None}
+    parents = {}
+    if parent_ids:
+        result = await db.execute(
+            select(Comment.id, Comment.post_id, Comment.path, Comment.depth)
+            .where(Comment.id.in_(parent_ids), Comment.is_deleted == False)
+        )
+        parents = {row.id: row for row in result}
+    
+    rows = []
+    parent_paths = []
+    for index, item in valid:
+        if item.post_id not in existing_post_ids:
+            errors.append(BulkItemError(index=index, detail="Post no encontrado"))
+            continue
+        parent = None
+        if item.parent_id is not None:
+            parent = parents.get(item.parent_id)
+            error = _parent_error(parent, item.post_id)
+            if error:
+                errors.append(BulkItemError(index=index, detail=error))
+                continue
+        rows.append({
+            "content": item.content,
+            "post_id": item.post_id,
+            "user_id": current_user.id,
+            "parent_id": item.parent_id,
+            "depth": parent.depth + 1 if parent else 0,
+        })
+        parent_paths.append(parent.path if parent else None)
+    errors.sort(key=lambda error: error.index)
+    raise_if_nothing_valid(rows, errors)
     
-    # Cargar la relación con el autor
     result = await db.execute(
-        select(Comment)
-        .options(selectinload(Comment.author))
-        .where(Comment.id == new_comment.id)
+        insert(Comment).returning(Comment.id, sort_by_parameter_order=True),
+        rows
     )
-    comment = result.scalar_one()
+    created_ids = list(result.scalars().all())
     
-    return comment
+    # Las rutas incluyen el id asignado: un UPDATE (executemany) por lote
+    comments_table = Comment.__table__
+    await db.execute(
+        update(comments_table)
+        .where(comments_table.c.id == bindparam("target_id"))
+        .values(path=bindparam("new_path")),
+        [
+            {"target_id": comment_id, "new_path": comment_path(comment_id, parent_path)}
+            for comment_id, parent_path in zip(created_ids, parent_paths)
+        ]
+    )
+    
+    # Un UPDATE (executemany) por lote para los contadores de cada post
+    per_post = {}
+    for row in rows:
+        per_post[row["post_id"]] = per_post.get(row["post_id"], 0) + 1
+    await db.execute(
+        update(posts_table)
+        .where(posts_table.c.id == bindparam("target_id"))
+        .values(
+            comment_count=posts_table.c.comment_count + bindparam("delta"),
+            updated_at=posts_table.c.updated_at
+        ),
+        [{"target_id": post_id, "delta": delta} for post_id, delta in per_post.items()]
+    )
+    await db.commit()
+    response_cache.invalidate(*{f"post:{row['post_id']}" for row in rows})
+    
+    return BulkCreateResponse(created_ids=created_ids, errors=errors)
 
 
 @router.get("/post/{post_id}", response_model=List[CommentResponse])
@@ -65,10 +296,13 @@ async def get_comments_by_post(
     post_id: int,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Listar todos los comentarios de un post específico
+    
+    - **after**: Cursor de la página anterior; si se envía, se ignora `skip`
     """
     # Verificar que el post existe
     result = await db.execute(
@@ -83,22 +317,96 @@ async def get_comments_by_post(
         )
     
     # Obtener comentarios del post
+    result = await db.execute(paginate(_comments_by_post_query(post_id), Comment.id, skip, after, limit))
+    comments = result.scalars().all()
+    
+    return model_response(List[CommentResponse], comments, headers=next_cursor_headers(comments, limit))
+
+
+@router.get("/post/{post_id}/threads", response_model=List[CommentResponse])
+async def get_threads_by_post(
+    post_id: int,
+    limit: int = Query(10, ge=1, le=100, description="Número de hilos (comentarios de primer nivel) a retornar"),
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
+    max_depth: Optional[int] = Query(None, ge=0, description="Profundidad máxima de las respuestas (0: solo primer nivel)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Listar los hilos de comentarios de un post, paginados por comentario de primer nivel
+    
+    Devuelve los comentarios de primer nivel de la página con todas sus
+    respuestas en preorden: cada respuesta aparece después de su padre y
+    `parent_id` / `depth` permiten reconstruir el árbol. Las respuestas de
+    toda la página se leen con una sola consulta por rango de rutas.
+    
+    - **after**: Cursor de la página anterior
+    - **max_depth**: Profundidad máxima de las respuestas
+    
+    Si los hilos de la página superan COMMENT_THREAD_MAX_ITEMS comentarios,
+    la página termina en el último hilo que cabe entero y X-Next-Cursor
+    apunta al siguiente. Un solo hilo más grande que el máximo se devuelve
+    cortado con el header X-Thread-Truncated: el resto de sus respuestas se
+    lee con `GET /comments/{id}/thread`.
+    """
     result = await db.execute(
-        select(Comment)
-        .options(selectinload(Comment.author))
-        .where(Comment.post_id == post_id, Comment.is_deleted == False)
-        .offset(skip)
-        .limit(limit)
+        select(Post.id).where(Post.id == post_id, Post.is_deleted == False)
     )
-    comments = result.scalars().all()
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post no encontrado"
+        )
+    
+    result = await db.execute(paginate(_thread_roots_query(post_id), Comment.id, 0, after, limit))
+    roots = result.all()
+    if not roots:
+        return model_response(List[CommentResponse], [])
     
-    return comments
+    # Los hilos de la página son un rango contiguo: del primero al último
+    start, _ = subtree_range(roots[0].path)
+    _, end = subtree_range(roots[-1].path)
+    result = await db.execute(_thread_query(post_id, start, end, max_depth))
+    
+    return _threads_page_response(result.scalars().all(), roots, limit)
+
+
+@router.get("/{comment_id}/thread", response_model=List[CommentResponse])
+async def get_comment_thread(
+    comment_id: int,
+    max_depth: Optional[int] = Query(None, ge=0, description="Niveles de respuestas bajo el comentario (0: solo el comentario)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Obtener un comentario con todas sus respuestas (subárbol), en preorden
+    
+    - **max_depth**: Niveles de respuestas a incluir, relativos al comentario
+    
+    Si el subárbol supera COMMENT_THREAD_MAX_ITEMS comentarios se corta y se
+    añade el header X-Thread-Truncated.
+    """
+    result = await db.execute(
+        select(Comment.post_id, Comment.path, Comment.depth)
+        .where(Comment.id == comment_id, Comment.is_deleted == False)
+    )
+    root = result.one_or_none()
+    
+    if not root:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comentario no encontrado"
+        )
+    
+    start, end = subtree_range(root.path)
+    depth_limit = None if max_depth is None else root.depth + max_depth
+    result = await db.execute(_thread_query(root.post_id, start, end, depth_limit))
+    
+    return _thread_response(result.scalars().all(), {})
 
 
 @router.get("/{comment_id}", response_model=CommentResponse)
 async def get_comment_by_id(
     comment_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Obtener un comentario específico por ID
@@ -131,41 +439,37 @@ async def update_comment(
     
     **Solo el autor del comentario puede actualizarlo**
     """
-    # Buscar el comentario
-    result = await db.execute(
-        select(Comment).where(Comment.id == comment_id, Comment.is_deleted == False)
-    )
+    # Un único UPDATE ... RETURNING que ya filtra por autor
+    conditions = (Comment.id == comment_id, Comment.is_deleted == False, Comment.user_id == current_user.id)
+    if comment_data.content is not None:
+        stmt = select(Comment).from_statement(
+            update(Comment).where(*conditions).values(content=comment_data.content).returning(Comment)
+        )
+    else:
+        stmt = select(Comment).where(*conditions)
+    result = await db.execute(stmt)
     comment = result.scalar_one_or_none()
     
     if not comment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Comentario no encontrado"
+        # Solo en el caso de error se consulta si el comentario existe
+        result = await db.execute(
+            select(Comment.user_id).where(Comment.id == comment_id, Comment.is_deleted == False)
         )
-    
-    # Verificar que el usuario actual sea el autor
-    if comment.user_id != current_user.id:
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Comentario no encontrado"
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permiso para editar este comentario"
         )
     
-    # Actualizar el contenido
-    if comment_data.content is not None:
-        comment.content = comment_data.content
-    
     await db.commit()
-    await db.refresh(comment)
+    response_cache.invalidate(f"post:{comment.post_id}")
+    set_committed_value(comment, "author", current_user)
     
-    # Cargar relación con el autor
-    result = await db.execute(
-        select(Comment)
-        .options(selectinload(Comment.author))
-        .where(Comment.id == comment.id)
-    )
-    updated_comment = result.scalar_one()
-    
-    return updated_comment
+    return comment
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -175,13 +479,19 @@ async def delete_comment(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Eliminar un comentario (soft delete)
+    Eliminar un comentario y todas sus respuestas (soft delete)
     
     **Solo el autor del comentario puede eliminarlo**
     """
-    # Buscar el comentario
+    # Buscar el comentario bloqueando la fila de su post (FOR UPDATE; SQLite
+    # lo ignora y bloquea la base en el primer UPDATE), en el mismo orden que
+    # create_comment: las respuestas que se confirmen antes entran en el
+    # UPDATE del subárbol y las posteriores ya ven el padre borrado
     result = await db.execute(
-        select(Comment).where(Comment.id == comment_id, Comment.is_deleted == False)
+        select(Comment)
+        .join(Post, Post.id == Comment.post_id)
+        .where(Comment.id == comment_id, Comment.is_deleted == False)
+        .with_for_update(of=Post)
     )
     comment = result.scalar_one_or_none()
     
@@ -198,8 +508,21 @@ async def delete_comment(
             detail="No tienes permiso para eliminar este comentario"
         )
     
-    # Soft delete
-    comment.is_deleted = True
+    # Soft delete del comentario y de su subárbol: un UPDATE por rango de rutas
+    start, end = subtree_range(comment.path)
+    result = await db.execute(
+        update(Comment)
+        .where(
+            Comment.post_id == comment.post_id,
+            Comment.path >= start,
+            Comment.path < end,
+            Comment.is_deleted == False
+        )
+        .values(is_deleted=True)
+        .returning(Comment.id)
+    )
+    await _add_comment_count(db, comment.post_id, -len(result.all()))
     await db.commit()
+    response_cache.invalidate(f"post:{comment.post_id}")
     
     return None
\ No newline at end of file
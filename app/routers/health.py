@@ -0,0 +1,30 @@
+from fastapi import APIRouter, HTTPException, status
+
+from app.core.lifespan import readiness
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live")
+async def live():
+    """
+    Liveness: el proceso responde
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready():
+    """
+    Readiness: el warmup terminó y el proceso no se está apagando
+
+    Responde 503 mientras arranca o drena los requests en curso, para que
+    el balanceador no le envíe tráfico.
+    """
+    if not readiness.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Apagando" if readiness.draining else "Iniciando",
+            headers={"Retry-After": "1"},
+        )
+    return {"status": "ready", "warmup_seconds": readiness.warmup_seconds}
@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import metrics_registry, render_gauges
+from app.core.dependencies import principal_cache
+from app.core.security import token_cache, hashing_pool
+from app.core.response_cache import response_cache
+from app.core.rate_limit import rate_limiter
+from app.core.lifespan import readiness
+
+router = APIRouter(tags=["Metrics"])
+
+# Content-Type del formato de texto de Prometheus
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Métricas del proceso en formato de texto de Prometheus
+    
+    Incluye latencia y tamaño de respuesta por ruta, conteo por status,
+    requests en curso, el estado de los caches, del pool de bcrypt y del
+    rate limit.
+    """
+    body = "".join([
+        metrics_registry.render(),
+        render_gauges("principal_cache", "Cache de usuarios autenticados", principal_cache.stats()),
+        render_gauges("token_cache", "Cache de tokens JWT verificados", token_cache.stats()),
+        render_gauges("response_cache", "Cache de respuestas con ETag", response_cache.stats()),
+        render_gauges("password_hash_pool", "Pool de bcrypt", hashing_pool.stats()),
+        render_gauges("rate_limiter", "Rate limit", rate_limiter.stats()),
+        render_gauges("lifecycle", "Estado del proceso", readiness.stats()),
+    ])
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
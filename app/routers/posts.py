@@ -1,16 +1,249 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import html
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Literal, Optional, Sequence, Set
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import DateTime, Select, delete, insert, select, update, func, or_, text
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.database.session import get_db
+from app.database.session import AsyncReadSessionLocal, get_db, get_read_db
+from app.database.instrumentation import mark_batched_queries
+from app.database.upsert import insert_ignore
 from app.models.post import Post
+from app.models.comment import Comment
 from app.models.user import User
-from app.schemas.post import PostCreate, PostUpdate, PostResponse
-from app.core.dependencies import get_current_active_user
+from app.models.tag import Tag
+from app.models.associations import post_tags
+from app.schemas.post import (
+    PostCreate, PostUpdate, PostResponse, PostSummary, PostExport, PostSearchResult, PostTagsUpdate, PostTagsPatch
+)
+from app.schemas.comment import CommentInDB
+from app.schemas.tag import TagResponse
+from app.core.dependencies import get_current_active_user, cache_principal
+from app.core.rate_limit import limit_writes
+from app.core.pagination import paginate, next_cursor_headers, decode_cursor
+from app.core.responses import model_response, serialize
+from app.core.response_cache import cached_json_response, response_cache
+from app.core.bulk import validate_bulk_items, raise_if_nothing_valid
+from app.schemas.bulk import BulkCreateRequest, BulkCreateResponse
 
-router = APIRouter(prefix="/posts", tags=["Posts"])
+router = APIRouter(prefix="/posts", tags=["Posts"], dependencies=[Depends(limit_writes)])
+
+# Separador para concatenar los nombres de tags en una sola columna
+TAG_SEPARATOR = "\x1f"
+
+# Longitud aproximada (en caracteres) del fragmento devuelto en búsquedas
+SNIPPET_LENGTH = 160
+
+# Posts por bloque en el export NDJSON: cada bloque carga sus comentarios y
+# tags con una consulta IN y se serializa antes de leer el siguiente
+EXPORT_CHUNK_SIZE = 500
+
+# Marcadores de las coincidencias en el fragmento de FTS5. Son caracteres de
+# uso privado: el fragmento se escapa como HTML y después se cambian por
+# <mark>/</mark>, para que el contenido del post no pueda inyectar HTML
+SNIPPET_MARK_START = "\ue000"
+SNIPPET_MARK_END = "\ue001"
+
+# Búsqueda con el índice FTS5 posts_fts, ordenada por relevancia (bm25)
+FTS_SEARCH_QUERY = text(
+    "SELECT p.id, p.title, p.user_id, p.created_at, p.updated_at, "
+    f"snippet(posts_fts, -1, '{SNIPPET_MARK_START}', '{SNIPPET_MARK_END}', '…', 24) AS snippet, "
+    "bm25(posts_fts, 10.0, 1.0) AS rank "
+    "FROM posts_fts JOIN posts AS p ON p.id = posts_fts.rowid "
+    "WHERE posts_fts MATCH :query AND p.is_deleted = 0 "
+    "ORDER BY rank LIMIT :limit OFFSET :skip"
+).columns(created_at=DateTime, updated_at=DateTime)
+
+# Indica si existe la tabla FTS5 posts_fts. Solo se recuerda cuando existe:
+# mientras no exista se vuelve a consultar, por si se aplica la migración
+# con el proceso en marcha
+_fts_available = False
+
+
+def _fts_query(q: str) -> str:
+    """Convierte el texto del usuario en una consulta FTS5 segura.
+
+    Cada palabra se envía entre comillas (sin operadores FTS) y la última
+    se busca como prefijo, de modo que "fast api" encuentra "FastAPI".
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in q.split()]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _like_pattern(term: str) -> str:
+    """Patrón LIKE que busca el término literal (con escape="\\")."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _highlighted_snippet(snippet: str) -> str:
+    """Escapa como HTML el fragmento de FTS5 y marca las coincidencias con <mark>."""
+    return (
+        html.escape(snippet)
+        .replace(SNIPPET_MARK_START, "<mark>")
+        .replace(SNIPPET_MARK_END, "</mark>")
+    )
+
+
+def _plain_snippet(content: str, q: str) -> str:
+    """Fragmento del contenido alrededor del primer término encontrado, escapado como HTML."""
+    lowered = content.lower()
+    positions = [lowered.find(term.lower()) for term in q.split()]
+    positions = [pos for pos in positions if pos >= 0]
+    start = max(min(positions) - SNIPPET_LENGTH // 4, 0) if positions else 0
+    snippet = content[start:start + SNIPPET_LENGTH]
+    if start > 0:
+        snippet = "…" + snippet
+    if start + SNIPPET_LENGTH < len(content):
+        snippet += "…"
+    return html.escape(snippet)
+
+
+async def _has_fts_index(db: AsyncSession) -> bool:
+    global _fts_available
+    if not _fts_available and db.bind.dialect.name == "sqlite":
+        result = await db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'")
+        )
+        _fts_available = result.scalar() is not None
+    return _fts_available
+
+
+def _unique(names: List[str]) -> List[str]:
+    return list(dict.fromkeys(name.strip() for name in names if name.strip()))
+
+
+def _filter_by_tags(stmt, names: Optional[List[str]], match: str, after: Optional[str]):
+    """Filtra los posts por nombre de tag con un semi-join sobre post_tags.
+
+    Con match="any" basta con uno de los tags; con "all" se exigen todos
+    (intersección mediante GROUP BY/HAVING). El índice (tag_id, post_id)
+    permite recorrer los posts de cada tag en orden de id, y el cursor se
+    aplica también dentro de la subconsulta para no leer páginas previas.
+    """
+    names = _unique(names or [])
+    if not names:
+        return stmt
+    
+    tagged = (
+        select(post_tags.c.post_id)
+        .join(Tag, Tag.id == post_tags.c.tag_id)
+        .where(Tag.name.in_(names), Tag.is_deleted == False)
+    )
+    if after is not None:
+        tagged = tagged.where(post_tags.c.post_id > decode_cursor(after))
+    if match == "all":
+        tagged = tagged.group_by(post_tags.c.post_id).having(
+            func.count(post_tags.c.tag_id) == len(names)
+        )
+    return stmt.where(Post.id.in_(tagged))
+
+
+# Las consultas de lectura se construyen en funciones para que
+# app.commands.check_query_plans y los tests de planes usen las mismas
+
+def _with_relations(stmt: Select) -> Select:
+    """Carga autor, comentarios (con su autor) y tags para PostResponse."""
+    return stmt.options(
+        selectinload(Post.author),
+        selectinload(Post.comments).selectinload(Comment.author),
+        selectinload(Post.tags)
+    )
+
+
+def _post_list_query(tag: Optional[List[str]], match: str, after: Optional[str]) -> Select:
+    """Posts no borrados con sus relaciones, sin paginar (ver paginate)."""
+    stmt = _with_relations(select(Post)).where(Post.is_deleted == False)
+    return _filter_by_tags(stmt, tag, match, after)
+
+
+def _post_detail_query(post_id: int) -> Select:
+    return _with_relations(select(Post)).where(Post.id == post_id, Post.is_deleted == False)
+
+
+def _post_summary_query(tag: Optional[List[str]], match: str, after: Optional[str]) -> Select:
+    """Resumen de posts con el username del autor y los tags concatenados, sin paginar."""
+    tag_names = (
+        select(func.aggregate_strings(Tag.name, TAG_SEPARATOR))
+        .select_from(post_tags.join(Tag, Tag.id == post_tags.c.tag_id))
+        .where(post_tags.c.post_id == Post.id, Tag.is_deleted == False)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Post.id,
+            Post.title,
+            Post.user_id,
+            Post.created_at,
+            Post.updated_at,
+            User.username.label("author_username"),
+            Post.comment_count,
+            tag_names.label("tag_names")
+        )
+        .join(User, User.id == Post.user_id)
+        .where(Post.is_deleted == False)
+    )
+    return _filter_by_tags(stmt, tag, match, after)
+
+
+def _export_query(
+    since: Optional[datetime],
+    author: Optional[str],
+    tag: Optional[List[str]],
+    match: str
+) -> Select:
+    stmt = select(Post).where(Post.is_deleted == False)
+    if since is not None:
+        stmt = stmt.where(Post.updated_at >= since)
+    if author is not None:
+        stmt = stmt.where(Post.user_id.in_(select(User.id).where(User.username == author)))
+    return _filter_by_tags(stmt, tag, match, None).order_by(Post.id)
+
+
+def _export_comments_query(post_ids: Sequence[int]) -> Select:
+    return (
+        select(Comment)
+        .where(Comment.post_id.in_(post_ids), Comment.is_deleted == False)
+        .order_by(Comment.id)
+    )
+
+
+def _export_tags_query(post_ids: Sequence[int]) -> Select:
+    return (
+        select(post_tags.c.post_id, Tag.name)
+        .join(Tag, Tag.id == post_tags.c.tag_id)
+        .where(post_tags.c.post_id.in_(post_ids), Tag.is_deleted == False)
+        .order_by(Tag.name)
+    )
+
+
+async def _add_user_post_count(db: AsyncSession, user: User, delta: int) -> None:
+    """Actualiza users.post_count en la transacción actual.
+
+    El valor sale del RETURNING y no se evalúa en Python sobre `user` (que
+    puede venir del cache de principals): con escrituras concurrentes del
+    mismo usuario, solo el de la base es correcto.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(post_count=User.post_count + delta, updated_at=User.updated_at)
+        .returning(User.post_count)
+        .execution_options(synchronize_session=False)
+    )
+    set_committed_value(user, "post_count", result.scalar_one())
+
+
+def _after_user_post_count_change(user: User) -> None:
+    """Refresca el cache del usuario y las respuestas que lo incluyen como autor."""
+    cache_principal(user)
+    response_cache.invalidate(f"user:{user.id}")
 
 
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
@@ -33,79 +266,276 @@ async def create_post(
     )
     
     db.add(new_post)
+    await _add_user_post_count(db, current_user, 1)
     await db.commit()
-    await db.refresh(new_post)
+    _after_user_post_count_change(current_user)
+    
+    # La respuesta se arma con lo que ya está en la sesión: el autor es el
+    # usuario actual y un post recién creado no tiene comentarios ni tags
+    set_committed_value(new_post, "author", current_user)
+    set_committed_value(new_post, "comments", [])
+    set_committed_value(new_post, "tags", [])
+    
+    return new_post
+
+
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_posts_bulk(
+    payload: BulkCreateRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Crear varios posts en una sola transacción (requiere autenticación)
+    
+    - **items**: Lista de posts con `title` y `content`
+    
+    Cada elemento se valida por separado: los inválidos se informan en
+    `errors` con su índice y el resto se inserta con un único INSERT.
+    """
+    valid, errors = validate_bulk_items(payload, PostCreate)
+    raise_if_nothing_valid(valid, errors)
     
-    # Cargar las relaciones para la respuesta
     result = await db.execute(
-        select(Post)
-        .options(
-            selectinload(Post.author),
-            selectinload(Post.comments),
-            selectinload(Post.tags)
-        )
-        .where(Post.id == new_post.id)
+        insert(Post).returning(Post.id, sort_by_parameter_order=True),
+        [
+            {"title": item.title, "content": item.content, "user_id": current_user.id}
+            for _, item in valid
+        ]
     )
-    post = result.scalar_one()
+    created_ids = list(result.scalars().all())
+    await _add_user_post_count(db, current_user, len(created_ids))
+    await db.commit()
+    _after_user_post_count_change(current_user)
     
-    return post
+    return BulkCreateResponse(created_ids=created_ids, errors=errors)
 
 
 @router.get("/", response_model=List[PostResponse])
 async def get_posts(
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
+    tag: Optional[List[str]] = Query(None, description="Filtrar por nombre de tag (se puede repetir)"),
+    match: Literal["any", "all"] = Query("any", description="Con varios tags: alguno (any) o todos (all)"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Listar todos los posts con paginación
     
     - **skip**: Cuántos posts saltar (para paginación)
     - **limit**: Cuántos posts traer (máximo 100)
+    - **after**: Cursor de la página anterior; si se envía, se ignora `skip`
+    - **tag**: Filtrar por tags, por ejemplo `?tag=python&tag=async&match=all`
+    """
+    stmt = _post_list_query(tag, match, after)
+    result = await db.execute(paginate(stmt, Post.id, skip, after, limit))
+    posts = result.scalars().all()
+    return model_response(List[PostResponse], posts, headers=next_cursor_headers(posts, limit))
+
+
+@router.get("/summary", response_model=List[PostSummary])
+async def get_posts_summary(
+    skip: int = Query(0, ge=0, description="Número de registros a omitir"),
+    limit: int = Query(10, ge=1, le=100, description="Número de registros a retornar"),
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
+    tag: Optional[List[str]] = Query(None, description="Filtrar por nombre de tag (se puede repetir)"),
+    match: Literal["any", "all"] = Query("any", description="Con varios tags: alguno (any) o todos (all)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Listar posts en formato resumido
+    
+    Devuelve el username del autor, el número de comentarios (contador
+    desnormalizado) y los nombres de los tags en una única consulta, sin
+    cargar los comentarios.
+    Admite el mismo filtro `tag`/`match` que `GET /posts/`.
+    Para el detalle completo usar `GET /posts/{post_id}`.
     """
+    stmt = _post_summary_query(tag, match, after)
+    result = await db.execute(paginate(stmt, Post.id, skip, after, limit))
+    rows = result.all()
+    
+    summaries = [
+        PostSummary(
+            id=row.id,
+            title=row.title,
+            user_id=row.user_id,
+            author_username=row.author_username,
+            comment_count=row.comment_count,
+            tags=row.tag_names.split(TAG_SEPARATOR) if row.tag_names else [],
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        )
+        for row in rows
+    ]
+    return model_response(List[PostSummary], summaries, headers=next_cursor_headers(rows, limit))
+
+
+@router.get("/search", response_model=List[PostSearchResult])
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200, description="Texto a buscar en título y contenido"),
+    skip: int = Query(0, ge=0, description="Número de registros a omitir"),
+    limit: int = Query(10, ge=1, le=100, description="Número de registros a retornar"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Buscar posts por texto en título y contenido
+    
+    En SQLite usa el índice FTS5 `posts_fts`: los resultados se ordenan por
+    relevancia (bm25, el título pesa más que el contenido) e incluyen un
+    fragmento con las coincidencias marcadas. En otros motores, o si la
+    migración no se aplicó, busca con LIKE sobre la tabla posts.
+    
+    `snippet` es HTML: el contenido del post va escapado y solo contiene
+    etiquetas `<mark>` alrededor de las coincidencias.
+    """
+    if not q.split():
+        return []
+    
+    if await _has_fts_index(db):
+        result = await db.execute(
+            FTS_SEARCH_QUERY,
+            {"query": _fts_query(q), "limit": limit, "skip": skip}
+        )
+        return [
+            PostSearchResult(
+                id=row.id,
+                title=row.title,
+                user_id=row.user_id,
+                snippet=_highlighted_snippet(row.snippet),
+                rank=row.rank,
+                created_at=row.created_at,
+                updated_at=row.updated_at
+            )
+            for row in result.all()
+        ]
+    
+    conditions = []
+    for term in q.split():
+        pattern = _like_pattern(term)
+        conditions.append(or_(
+            Post.title.ilike(pattern, escape="\\"),
+            Post.content.ilike(pattern, escape="\\")
+        ))
     result = await db.execute(
         select(Post)
-        .options(
-            selectinload(Post.author),
-            selectinload(Post.comments),
-            selectinload(Post.tags)
-        )
-        .where(Post.is_deleted == False)
+        .where(Post.is_deleted == False, *conditions)
+        .order_by(Post.id.desc())
         .offset(skip)
         .limit(limit)
     )
-    posts = result.scalars().all()
-    return posts
+    return [
+        PostSearchResult(
+            id=post.id,
+            title=post.title,
+            user_id=post.user_id,
+            snippet=_plain_snippet(post.content, q),
+            created_at=post.created_at,
+            updated_at=post.updated_at
+        )
+        for post in result.scalars().all()
+    ]
+
+
+async def _export_chunk(db: AsyncSession, posts: Sequence[Post]) -> bytes:
+    """Carga los comentarios y tags de un bloque de posts y lo serializa en NDJSON."""
+    post_ids = [post.id for post in posts]
+    
+    comments: Dict[int, List[Comment]] = {}
+    result = await db.execute(_export_comments_query(post_ids))
+    for comment in result.scalars():
+        comments.setdefault(comment.post_id, []).append(comment)
+    
+    tags: Dict[int, List[str]] = {}
+    result = await db.execute(_export_tags_query(post_ids))
+    for post_id, name in result:
+        tags.setdefault(post_id, []).append(name)
+    
+    lines = []
+    for post in posts:
+        line = PostExport(
+            id=post.id,
+            title=post.title,
+            content=post.content,
+            user_id=post.user_id,
+            comment_count=post.comment_count,
+            created_at=post.created_at,
+            updated_at=post.updated_at,
+            comments=[CommentInDB.model_validate(comment) for comment in comments.get(post.id, [])],
+            tags=tags.get(post.id, [])
+        )
+        lines.append(line.model_dump_json().encode("utf-8"))
+    return b"\n".join(lines) + b"\n"
+
+
+async def _export_lines(stmt) -> AsyncIterator[bytes]:
+    """Recorre la consulta con un cursor en streaming, bloque a bloque.
+    
+    Usa su propia sesión de lectura, que vive mientras dura la respuesta.
+    El identity map de la sesión guarda referencias débiles, así que los
+    objetos de cada bloque se liberan al pasar al siguiente y la memoria no
+    crece con el número de posts.
+    """
+    async with AsyncReadSessionLocal() as db:
+        result = await db.stream_scalars(stmt)
+        async for posts in result.partitions():
+            yield await _export_chunk(db, posts)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_posts(
+    since: Optional[datetime] = Query(None, description="Solo posts creados o modificados desde esta fecha"),
+    author: Optional[str] = Query(None, description="Username del autor"),
+    tag: Optional[List[str]] = Query(None, description="Filtrar por nombre de tag (se puede repetir)"),
+    match: Literal["any", "all"] = Query("any", description="Con varios tags: alguno (any) o todos (all)")
+):
+    """
+    Exportar posts en formato NDJSON (un post por línea, en orden de id)
+    
+    Cada línea incluye los comentarios no borrados y los nombres de los
+    tags. La respuesta se genera en streaming: los posts se leen con un
+    cursor y se procesan en bloques, sin cargar la tabla en memoria.
+    
+    - **since**: Posts con `updated_at` igual o posterior (exports incrementales)
+    - **author**: Username del autor
+    - **tag**: Filtrar por tags, por ejemplo `?tag=python&tag=async&match=all`
+    """
+    stmt = _export_query(since, author, tag, match).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    # Las consultas por bloque se repiten a propósito: no son un N+1
+    mark_batched_queries()
+    
+    return StreamingResponse(_export_lines(stmt), media_type="application/x-ndjson")
 
 
 @router.get("/{post_id}", response_model=PostResponse)
 async def get_post_by_id(
     post_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Obtener un post específico por ID
     
-    Incluye: autor, comentarios y tags
+    Incluye: autor, comentarios y tags. Soporta ETag / If-None-Match.
     """
-    result = await db.execute(
-        select(Post)
-        .options(
-            selectinload(Post.author),
-            selectinload(Post.comments),
-            selectinload(Post.tags)
-        )
-        .where(Post.id == post_id, Post.is_deleted == False)
-    )
-    post = result.scalar_one_or_none()
-    
-    if not post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Post no encontrado"
-        )
+    async def build():
+        result = await db.execute(_post_detail_query(post_id))
+        post = result.scalar_one_or_none()
+        
+        if not post:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Post no encontrado"
+            )
+        
+        body = serialize(PostResponse, post)
+        dependencies = {f"post:{post.id}", f"user:{post.user_id}"}
+        dependencies.update(f"user:{comment.user_id}" for comment in post.comments)
+        dependencies.update(f"tag:{tag.id}" for tag in post.tags)
+        return body, dependencies, {}
     
-    return post
+    return await cached_json_response(request, ("post", post_id), build)
 
 
 @router.put("/{post_id}", response_model=PostResponse)
@@ -120,47 +550,44 @@ async def update_post(
     
     **Solo el autor del post puede actualizarlo**
     """
-    # Buscar el post
+    # Actualizar solo los campos proporcionados, en un único UPDATE ... RETURNING
+    # que ya filtra por autor; las relaciones se cargan con la misma consulta
+    values = post_data.model_dump(exclude_none=True)
+    conditions = (Post.id == post_id, Post.is_deleted == False, Post.user_id == current_user.id)
+    if values:
+        stmt = select(Post).from_statement(
+            update(Post).where(*conditions).values(**values).returning(Post)
+        )
+    else:
+        stmt = select(Post).where(*conditions)
     result = await db.execute(
-        select(Post).where(Post.id == post_id, Post.is_deleted == False)
+        stmt.options(
+            selectinload(Post.comments).selectinload(Comment.author),
+            selectinload(Post.tags)
+        )
     )
     post = result.scalar_one_or_none()
     
     if not post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Post no encontrado"
+        # Solo en el caso de error se consulta si el post existe
+        result = await db.execute(
+            select(Post.user_id).where(Post.id == post_id, Post.is_deleted == False)
         )
-    
-    # Verificar que el usuario actual sea el autor
-    if post.user_id != current_user.id:
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Post no encontrado"
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permiso para editar este post"
         )
     
-    # Actualizar solo los campos proporcionados
-    if post_data.title is not None:
-        post.title = post_data.title
-    if post_data.content is not None:
-        post.content = post_data.content
-    
     await db.commit()
-    await db.refresh(post)
-    
-    # Cargar relaciones para la respuesta
-    result = await db.execute(
-        select(Post)
-        .options(
-            selectinload(Post.author),
-            selectinload(Post.comments),
-            selectinload(Post.tags)
-        )
-        .where(Post.id == post.id)
-    )
-    updated_post = result.scalar_one()
+    response_cache.invalidate(f"post:{post.id}")
+    set_committed_value(post, "author", current_user)
     
-    return updated_post
+    return post
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -193,8 +620,173 @@ async def delete_post(
             detail="No tienes permiso para eliminar este post"
         )
     
-    # Soft delete
+    # Soft delete y actualización de contadores del autor y de los tags
     post.is_deleted = True
+    await _add_user_post_count(db, current_user, -1)
+    tag_ids = await _current_tag_ids(db, post.id)
+    await _add_tag_post_count(db, tag_ids, -1)
     await db.commit()
+    _after_user_post_count_change(current_user)
+    response_cache.invalidate(f"post:{post.id}", *_tag_dependencies(tag_ids))
     
     return None
+
+
+async def _get_own_post(db: AsyncSession, post_id: int, user_id: int) -> Post:
+    """Obtiene un post no borrado y verifica que pertenezca al usuario."""
+    result = await db.execute(
+        select(Post).where(Post.id == post_id, Post.is_deleted == False)
+    )
+    post = result.scalar_one_or_none()
+    
+    if not post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post no encontrado"
+        )
+    
+    if post.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para editar este post"
+        )
+    
+    return post
+
+
+async def _upsert_tags(db: AsyncSession, names: List[str]) -> None:
+    """Crea los tags que no existen y reactiva los borrados, en dos sentencias."""
+    dialect_name = db.bind.dialect.name
+    await db.execute(
+        insert_ignore(Tag.__table__, dialect_name, index_elements=["name"]),
+        [{"name": name} for name in names]
+    )
+    await db.execute(
+        update(Tag)
+        .where(Tag.name.in_(names), Tag.is_deleted == True)
+        .values(is_deleted=False)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _tag_ids(db: AsyncSession, names: List[str]) -> Set[int]:
+    if not names:
+        return set()
+    result = await db.execute(select(Tag.id).where(Tag.name.in_(names)))
+    return set(result.scalars().all())
+
+
+async def _current_tag_ids(db: AsyncSession, post_id: int) -> Set[int]:
+    result = await db.execute(select(post_tags.c.tag_id).where(post_tags.c.post_id == post_id))
+    return set(result.scalars().all())
+
+
+async def _add_tag_post_count(db: AsyncSession, tag_ids: Set[int], delta: int) -> None:
+    """Actualiza tags.post_count de varios tags con un solo UPDATE."""
+    if tag_ids:
+        await db.execute(
+            update(Tag)
+            .where(Tag.id.in_(tag_ids))
+            .values(post_count=Tag.post_count + delta, updated_at=Tag.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def _apply_tag_diff(db: AsyncSession, post_id: int, added: Set[int], removed: Set[int]) -> None:
+    """Aplica la diferencia de tags del post y sus contadores, con sentencias por conjunto."""
+    if added:
+        await db.execute(
+            insert_ignore(post_tags, db.bind.dialect.name, index_elements=["post_id", "tag_id"]),
+            [{"post_id": post_id, "tag_id": tag_id} for tag_id in added]
+        )
+        await _add_tag_post_count(db, added, 1)
+    
+    if removed:
+        await db.execute(
+            delete(post_tags).where(
+                post_tags.c.post_id == post_id,
+                post_tags.c.tag_id.in_(removed)
+            )
+        )
+        await _add_tag_post_count(db, removed, -1)
+
+
+def _tag_dependencies(tag_ids: Set[int]) -> List[str]:
+    return ["tags", *(f"tag:{tag_id}" for tag_id in tag_ids)]
+
+
+async def _post_tags(db: AsyncSession, post_id: int) -> List[Tag]:
+    result = await db.execute(
+        select(Tag)
+        .join(post_tags, post_tags.c.tag_id == Tag.id)
+        .where(post_tags.c.post_id == post_id)
+        .order_by(Tag.name)
+    )
+    return list(result.scalars().all())
+
+
+@router.put("/{post_id}/tags", response_model=List[TagResponse])
+async def replace_post_tags(
+    post_id: int,
+    tags_data: PostTagsUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Reemplazar el conjunto de tags de un post
+    
+    - **names**: Nombres de los tags. Los que no existen se crean.
+    
+    El número de consultas no depende de la cantidad de tags.
+    **Solo el autor del post puede modificarlo**
+    """
+    await _get_own_post(db, post_id, current_user.id)
+    names = _unique(tags_data.names)
+    
+    if names:
+        await _upsert_tags(db, names)
+    target = await _tag_ids(db, names)
+    current = await _current_tag_ids(db, post_id)
+    
+    # Añadir los que faltan y quitar los que no están en la lista
+    added, removed = target - current, current - target
+    await _apply_tag_diff(db, post_id, added, removed)
+    
+    await db.commit()
+    response_cache.invalidate(f"post:{post_id}", *_tag_dependencies(added | removed))
+    
+    return await _post_tags(db, post_id)
+
+
+@router.patch("/{post_id}/tags", response_model=List[TagResponse])
+async def patch_post_tags(
+    post_id: int,
+    tags_data: PostTagsPatch,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Añadir y quitar tags de un post sin tocar el resto
+    
+    - **add**: Nombres de tags a añadir. Los que no existen se crean.
+    - **remove**: Nombres de tags a quitar.
+    
+    **Solo el autor del post puede modificarlo**
+    """
+    await _get_own_post(db, post_id, current_user.id)
+    add = _unique(tags_data.add)
+    remove = [name for name in _unique(tags_data.remove) if name not in add]
+    
+    if add:
+        await _upsert_tags(db, add)
+    add_ids = await _tag_ids(db, add)
+    remove_ids = await _tag_ids(db, remove)
+    current = await _current_tag_ids(db, post_id)
+    
+    added, removed = add_ids - current, remove_ids & current
+    await _apply_tag_diff(db, post_id, added, removed)
+    
+    await db.commit()
+    response_cache.invalidate(f"post:{post_id}", *_tag_dependencies(added | removed))
+    
+    return await _post_tags(db, post_id)
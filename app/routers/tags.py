@@ -1,16 +1,27 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from app.database.session import get_db
+from app.database.session import get_db, get_read_db
+from app.database.upsert import insert_ignore
 from app.models.tag import Tag
 from app.models.user import User
 from app.schemas.tag import TagCreate, TagUpdate, TagResponse
 from app.core.dependencies import get_current_active_user
+from app.core.rate_limit import limit_writes
+from app.core.pagination import paginate, next_cursor_headers
+from app.core.response_cache import cached_json_response, response_cache
+from app.core.responses import serialize
+from app.core.bulk import validate_bulk_items, raise_if_nothing_valid
+from app.schemas.bulk import BulkCreateRequest, BulkCreateResponse, BulkItemError
 
-router = APIRouter(prefix="/tags", tags=["Tags"])
+router = APIRouter(prefix="/tags", tags=["Tags"], dependencies=[Depends(limit_writes)])
+
+
+def _tag_body(tag: Tag) -> bytes:
+    return serialize(TagResponse, tag)
 
 
 @router.post("/", response_model=TagResponse, status_code=status.HTTP_201_CREATED)
@@ -43,72 +54,141 @@ async def create_tag(
     
     db.add(new_tag)
     await db.commit()
+    response_cache.invalidate("tags")
     await db.refresh(new_tag)
     
     return new_tag
 
 
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_tags_bulk(
+    payload: BulkCreateRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Crear varios tags en una sola transacción
+    
+    - **items**: Lista de tags con `name`
+    
+    Los nombres ya existentes o repetidos dentro del lote se informan en
+    `errors` con su índice. Requiere autenticación
+    
+    El INSERT ignora los nombres que ya existen (también los de tags
+    borrados, que siguen en el índice único), así que dos lotes
+    concurrentes con el mismo nombre no fallan: el segundo lo informa
+    como error de ese elemento.
+    """
+    valid, errors = validate_bulk_items(payload, TagCreate)
+    
+    first_index: Dict[str, int] = {}
+    for index, item in valid:
+        if item.name in first_index:
+            errors.append(BulkItemError(index=index, detail="Ya existe un tag con ese nombre"))
+        else:
+            first_index[item.name] = index
+    raise_if_nothing_valid(first_index, errors)
+    
+    result = await db.execute(
+        insert_ignore(Tag.__table__, db.bind.dialect.name, index_elements=["name"])
+        .returning(Tag.__table__.c.name, Tag.__table__.c.id),
+        [{"name": name} for name in first_index]
+    )
+    created = dict(result.all())
+    await db.commit()
+    
+    created_ids = []
+    for name, index in first_index.items():
+        if name in created:
+            created_ids.append(created[name])
+        else:
+            errors.append(BulkItemError(index=index, detail="Ya existe un tag con ese nombre"))
+    errors.sort(key=lambda error: error.index)
+    raise_if_nothing_valid(created_ids, errors)
+    response_cache.invalidate("tags")
+    
+    return BulkCreateResponse(created_ids=created_ids, errors=errors)
+
+
 @router.get("/", response_model=List[TagResponse])
 async def get_tags(
+    request: Request,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(50, ge=1, le=100, description="Número de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Listar todos los tags con paginación
+    
+    - **after**: Cursor de la página anterior; si se envía, se ignora `skip`
+    
+    Soporta ETag / If-None-Match.
     """
-    result = await db.execute(
-        select(Tag)
-        .where(Tag.is_deleted == False)
-        .offset(skip)
-        .limit(limit)
-    )
-    tags = result.scalars().all()
-    return tags
+    async def build():
+        stmt = select(Tag).where(Tag.is_deleted == False)
+        result = await db.execute(paginate(stmt, Tag.id, skip, after, limit))
+        tags = result.scalars().all()
+        body = serialize(List[TagResponse], tags)
+        return body, {"tags"}, next_cursor_headers(tags, limit)
+    
+    return await cached_json_response(request, ("tags", skip, limit, after), build)
 
 
 @router.get("/{tag_id}", response_model=TagResponse)
 async def get_tag_by_id(
     tag_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Obtener un tag específico por ID
-    """
-    result = await db.execute(
-        select(Tag).where(Tag.id == tag_id, Tag.is_deleted == False)
-    )
-    tag = result.scalar_one_or_none()
     
-    if not tag:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tag no encontrado"
+    Soporta ETag / If-None-Match.
+    """
+    async def build():
+        result = await db.execute(
+            select(Tag).where(Tag.id == tag_id, Tag.is_deleted == False)
         )
+        tag = result.scalar_one_or_none()
+        
+        if not tag:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tag no encontrado"
+            )
+        
+        return _tag_body(tag), {f"tag:{tag.id}"}, {}
     
-    return tag
+    return await cached_json_response(request, ("tag", tag_id), build)
 
 
 @router.get("/name/{tag_name}", response_model=TagResponse)
 async def get_tag_by_name(
     tag_name: str,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Obtener un tag específico por nombre
-    """
-    result = await db.execute(
-        select(Tag).where(Tag.name == tag_name, Tag.is_deleted == False)
-    )
-    tag = result.scalar_one_or_none()
     
-    if not tag:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tag no encontrado"
+    Soporta ETag / If-None-Match.
+    """
+    async def build():
+        result = await db.execute(
+            select(Tag).where(Tag.name == tag_name, Tag.is_deleted == False)
         )
+        tag = result.scalar_one_or_none()
+        
+        if not tag:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tag no encontrado"
+            )
+        
+        return _tag_body(tag), {f"tag:{tag.id}"}, {}
     
-    return tag
+    return await cached_json_response(request, ("tag_name", tag_name), build)
 
 
 @router.put("/{tag_id}", response_model=TagResponse)
@@ -148,6 +228,7 @@ async def update_tag(
         tag.name = tag_data.name
     
     await db.commit()
+    response_cache.invalidate("tags", f"tag:{tag.id}")
     await db.refresh(tag)
     
     return tag
@@ -179,5 +260,6 @@ async def delete_tag(
     # Soft delete
     tag.is_deleted = True
     await db.commit()
+    response_cache.invalidate("tags", f"tag:{tag.id}")
     
     return None
\ No newline at end of file
@@ -1,15 +1,21 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
-from app.database.session import get_db
+from app.database.session import get_db, get_read_db
 from app.models.user import User
+from app.models.post import Post
+from app.models.comment import Comment
 from app.schemas.user import UserResponse, UserUpdate, UserWithPosts
-from app.core.dependencies import get_current_active_user
+from app.core.dependencies import get_current_active_user, invalidate_principal
+from app.core.rate_limit import limit_writes
+from app.core.pagination import paginate, set_next_cursor
+from app.core.responses import model_response
+from app.core.response_cache import response_cache
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], dependencies=[Depends(limit_writes)])
 
 
 @router.get("/me", response_model=UserResponse)
@@ -25,14 +31,19 @@ async def get_current_user_info(
 @router.get("/{user_id}", response_model=UserWithPosts)
 async def get_user_by_id(
     user_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Obtener un usuario específico por ID con sus posts
     """
     result = await db.execute(
         select(User)
-        .options(selectinload(User.posts))
+        .options(
+            selectinload(User.posts).options(
+                selectinload(Post.comments).selectinload(Comment.author),
+                selectinload(Post.tags)
+            )
+        )
         .where(User.id == user_id, User.is_deleted == False)
     )
     user = result.scalar_one_or_none()
@@ -43,25 +54,26 @@ async def get_user_by_id(
             detail="Usuario no encontrado"
         )
     
-    return user
+    return model_response(UserWithPosts, user)
 
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Listar todos los usuarios con paginación
+    
+    - **after**: Cursor de la página anterior; si se envía, se ignora `skip`
     """
-    result = await db.execute(
-        select(User)
-        .where(User.is_deleted == False)
-        .offset(skip)
-        .limit(limit)
-    )
+    stmt = select(User).where(User.is_deleted == False)
+    result = await db.execute(paginate(stmt, User.id, skip, after, limit))
     users = result.scalars().all()
+    set_next_cursor(response, users, limit)
     return users
 
 
@@ -98,12 +110,14 @@ async def update_current_user(
     if user_data.username:
         current_user.username = user_data.username
     if user_data.password:
-        from app.core.security import get_password_hash
-        current_user.hashed_password = get_password_hash(user_data.password)
+        from app.core.security import get_password_hash_async
+        current_user.hashed_password = await get_password_hash_async(user_data.password)
     if user_data.is_active is not None:
         current_user.is_active = user_data.is_active
     
     await db.commit()
+    invalidate_principal(current_user.id)
+    response_cache.invalidate(f"user:{current_user.id}")
     await db.refresh(current_user)
     
     return current_user
@@ -121,5 +135,7 @@ async def delete_current_user(
     current_user.is_active = False
     
     await db.commit()
+    invalidate_principal(current_user.id)
+    response_cache.invalidate(f"user:{current_user.id}")
     
     return None
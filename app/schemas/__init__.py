@@ -1,14 +1,16 @@
 
 from app.schemas.user import UserCreate, UserResponse, UserUpdate, UserInDB, UserWithPosts
-from app.schemas.post import PostCreate, PostResponse, PostUpdate, PostInDB
+from app.schemas.post import PostCreate, PostResponse, PostUpdate, PostInDB, PostSummary, PostExport, PostSearchResult, PostTagsUpdate, PostTagsPatch
 from app.schemas.comment import CommentCreate, CommentResponse, CommentUpdate,CommentInDB
 from app.schemas.tag import TagCreate,  TagUpdate , TagResponse, TagInDB 
 from app.schemas.token import Token, TokenData
+from app.schemas.bulk import BulkCreateRequest, BulkCreateResponse, BulkItemError
 
 from pydantic import ConfigDict
 # Resuelve el problema de referencias circulares entre esquemas
 PostResponse.model_rebuild()
 CommentResponse.model_rebuild()
+PostExport.model_rebuild()
 UserWithPosts.model_rebuild()
 
 __all__ = [
@@ -20,6 +22,11 @@ __all__ = [
     "PostResponse",
     "PostUpdate",
     "PostInDB",
+    "PostSummary",
+    "PostExport",
+    "PostSearchResult",
+    "PostTagsUpdate",
+    "PostTagsPatch",
     "CommentCreate",
     "CommentResponse",
     "CommentUpdate",
@@ -29,5 +36,8 @@ __all__ = [
     "TagUpdate",
     "TagInDB",
     "Token",
-    "TokenData"
+    "TokenData",
+    "BulkCreateRequest",
+    "BulkCreateResponse",
+    "BulkItemError"
 ]
\ No newline at end of file
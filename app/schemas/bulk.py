@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Union
+
+class BulkCreateRequest(BaseModel):
+    """Esquema para crear varios registros en una sola petición
+
+    Args:
+        BaseModel (_type_): Clase base de Pydantic para modelos de datos.
+    """
+    # Sin validar aquí: un elemento que no es un objeto se informa en
+    # `errors` con su índice en lugar de rechazar todo el lote
+    items: List[Any] = Field(..., min_length=1)
+
+class BulkItemError(BaseModel):
+    """Error de validación de un elemento del lote
+
+    Args:
+        BaseModel (_type_): Clase base de Pydantic para modelos de datos.
+    """
+    index: int
+    detail: Union[str, List[Dict[str, Any]]]
+
+class BulkCreateResponse(BaseModel):
+    """Esquema para la respuesta de una creación en lote
+
+    Args:
+        BaseModel (_type_): Clase base de Pydantic para modelos de datos.
+    """
+    created_ids: List[int] = []
+    errors: List[BulkItemError] = []
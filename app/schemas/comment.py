@@ -21,6 +21,8 @@ class CommentCreate(CommentBase):
         CommentBase (_type_): Campos comunes del Comment.
     """
     post_id: int
+    # Comentario al que responde (del mismo post); None para uno de primer nivel
+    parent_id: Optional[int] = None
     
 class CommentUpdate(BaseModel):
     """Esquema para actualizar un Comment existente
@@ -39,6 +41,9 @@ class CommentInDB(CommentBase):
     id: int
     post_id: int
     user_id: int
+    parent_id: Optional[int] = None
+    # Nivel en el hilo: 0 para los comentarios de primer nivel
+    depth: int = 0
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime] = None
@@ -1,10 +1,10 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List, TYPE_CHECKING
+from typing import Annotated, Optional, List, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from app.schemas.user import UserResponse
-    from app.schemas.comment import CommentResponse
+    from app.schemas.comment import CommentResponse, CommentInDB
     from app.schemas.tag import TagResponse
 
 class PostBase(BaseModel):
@@ -42,6 +42,7 @@ class PostInDB(PostBase):
     """
     id: int
     user_id: int
+    comment_count: int = 0
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime] = None
@@ -56,4 +57,70 @@ class PostResponse(PostInDB):
     """
     author: Optional['UserResponse'] = None
     comments: List['CommentResponse'] = []
-    tags: List['TagResponse'] = []
\ No newline at end of file
+    tags: List['TagResponse'] = []
+
+
+class PostSummary(BaseModel):
+    """Esquema ligero para listados de Posts, sin la colección de comentarios
+
+    Args:
+        BaseModel (_type_): Clase base de Pydantic para modelos de datos.
+    """
+    id: int
+    title: str
+    user_id: int
+    author_username: str
+    comment_count: int = 0
+    tags: List[str] = []
+    created_at: datetime
+    updated_at: datetime
+
+
+class PostExport(PostInDB):
+    """Esquema de cada línea del export NDJSON de Posts
+
+    Incluye los comentarios no borrados y los nombres de los tags, sin
+    anidar los datos de los autores.
+
+    Args:
+        PostInDB (_type_): Campos del Post en la base de datos.
+    """
+    comments: List['CommentInDB'] = []
+    tags: List[str] = []
+
+
+class PostSearchResult(BaseModel):
+    """Esquema para un resultado de la búsqueda de Posts
+
+    Args:
+        BaseModel (_type_): Clase base de Pydantic para modelos de datos.
+    """
+    id: int
+    title: str
+    user_id: int
+    snippet: str
+    rank: Optional[float] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+TagName = Annotated[str, Field(min_length=1, max_length=50)]
+
+
+class PostTagsUpdate(BaseModel):
+    """Esquema para reemplazar el conjunto de tags de un Post
+
+    Args:
+        BaseModel (_type_): Clase base de Pydantic para modelos de datos.
+    """
+    names: List[TagName] = Field(default_factory=list, max_length=100)
+
+
+class PostTagsPatch(BaseModel):
+    """Esquema para añadir y quitar tags de un Post
+
+    Args:
+        BaseModel (_type_): Clase base de Pydantic para modelos de datos.
+    """
+    add: List[TagName] = Field(default_factory=list, max_length=100)
+    remove: List[TagName] = Field(default_factory=list, max_length=100)
@@ -36,6 +36,7 @@ class TagInDB(TagBase):
         TagBase (_type_): Campos comunes del Tag.
     """
     id: int
+    post_count: int = 0
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime] = None
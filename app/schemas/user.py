@@ -40,8 +40,13 @@ class UserInDB(UserBase):
     Args:
         UserBase (_type_): Hereda los campos base del usuario.
     """
+    # Ya se validó al crear o actualizar el usuario: en la salida no se
+    # repite la validación de EmailStr, que domina el coste de serializar
+    # listados con autores anidados
+    email: str = Field(..., json_schema_extra={"format": "email"})
     id: int
     is_active: bool
+    post_count: int = 0
     created_at: datetime
     updated_at: datetime
 
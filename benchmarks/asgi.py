@@ -0,0 +1,131 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from starlette.types import ASGIApp, Message
+
+
+class ASGIResponse:
+    """Respuesta capturada de la aplicación."""
+
+    def __init__(self, status_code: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status_code = status_code
+        self.headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in headers}
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class ASGIClient:
+    """
+    Cliente HTTP mínimo que llama a la aplicación ASGI en el mismo proceso,
+    sin sockets ni dependencias extra (httpx no forma parte de requirements).
+
+    Usado como context manager ejecuta el lifespan de la aplicación.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._lifespan_task: Optional[asyncio.Task] = None
+        self._lifespan_receive: "asyncio.Queue[Message]" = asyncio.Queue()
+        self._lifespan_send: "asyncio.Queue[Message]" = asyncio.Queue()
+
+    async def __aenter__(self) -> "ASGIClient":
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self._lifespan_task = asyncio.create_task(
+            self.app(scope, self._lifespan_receive.get, self._lifespan_send.put)
+        )
+        await self._lifespan_receive.put({"type": "lifespan.startup"})
+        message = await self._lifespan_send.get()
+        if message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(message.get("message", "Falló el arranque de la aplicación"))
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._lifespan_receive.put({"type": "lifespan.shutdown"})
+        await self._lifespan_send.get()
+        await self._lifespan_task
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        json_body: Any = None,
+        form: Optional[Dict[str, str]] = None
+    ) -> ASGIResponse:
+        """Envía un request y devuelve la respuesta completa.
+
+        Args:
+            method (str): Método HTTP.
+            path (str): Ruta, con query string opcional.
+            headers (Optional[Dict[str, str]]): Headers adicionales.
+            json_body (Any): Cuerpo JSON.
+            form (Optional[Dict[str, str]]): Cuerpo application/x-www-form-urlencoded.
+
+        Returns:
+            ASGIResponse: Status, headers y cuerpo.
+        """
+        body = b""
+        raw_headers = [(b"host", b"benchmark")]
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            raw_headers.append((b"content-type", b"application/json"))
+        elif form is not None:
+            body = urlencode(form).encode("utf-8")
+            raw_headers.append((b"content-type", b"application/x-www-form-urlencoded"))
+        raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        for key, value in (headers or {}).items():
+            raw_headers.append((key.lower().encode("latin-1"), value.encode("latin-1")))
+
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "query_string": query.encode("latin-1"),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("benchmark", 80),
+        }
+
+        request_sent = False
+        response_done = asyncio.Event()
+        status_code = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            nonlocal status_code, response_headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            # Como un servidor real: el error se reporta como 500 y la
+            # medición sigue (ServerErrorMiddleware ya envió la respuesta)
+            status_code = 500
+        finally:
+            response_done.set()
+        return ASGIResponse(status_code, response_headers, b"".join(chunks))
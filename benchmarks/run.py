@@ -0,0 +1,377 @@
+"""
+Benchmark HTTP de la API: ejecuta la aplicación en el mismo proceso contra
+una base de datos SQLite sembrada y mide throughput y latencias p50/p95/p99
+por ruta con distintas mezclas de escenarios y niveles de concurrencia.
+
+Los resultados se guardan en JSON y se comparan con benchmarks/baseline.json;
+termina con código 1 si alguna ruta empeora más que el umbral.
+
+Uso:
+    python -m benchmarks.run
+    python -m benchmarks.run --mix read,mixed --concurrency 1,16 --requests 3000
+    python -m benchmarks.run --save-baseline
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+ROOT = BENCHMARKS_DIR.parent
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+# Contraseña de todos los usuarios sembrados
+BENCH_PASSWORD = "benchmark-password"
+
+# Mezclas de escenarios con el peso relativo de cada uno
+MIXES: Dict[str, Dict[str, int]] = {
+    "read": {"list_posts": 50, "get_post": 50},
+    "write": {"comment": 70, "login": 15, "register": 15},
+    "mixed": {"list_posts": 40, "get_post": 40, "comment": 12, "login": 4, "register": 4},
+}
+
+# Ruta con la que se reporta cada escenario
+ROUTES = {
+    "list_posts": "GET /posts/",
+    "get_post": "GET /posts/{post_id}",
+    "comment": "POST /comments/",
+    "login": "POST /auth/login",
+    "register": "POST /auth/register",
+}
+
+# Las muestras con menos requests que esto no se comparan con el baseline
+MIN_SAMPLES = 20
+
+
+@dataclass
+class Dataset:
+    """Tamaño de los datos sembrados."""
+    users: int
+    posts: int
+    comments: int
+
+
+@dataclass
+class RouteSamples:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+
+class Scenarios:
+    """Escenarios del benchmark: cada uno envía un request y devuelve su status."""
+
+    def __init__(self, client, dataset: Dataset, tokens: List[str], run_id: str):
+        self.client = client
+        self.dataset = dataset
+        self.tokens = tokens
+        self.run_id = run_id
+        self._registered = 0
+
+    async def list_posts(self, rng: random.Random) -> int:
+        response = await self.client.request("GET", "/posts/?limit=20")
+        return response.status_code
+
+    async def get_post(self, rng: random.Random) -> int:
+        post_id = rng.randint(1, self.dataset.posts)
+        response = await self.client.request("GET", f"/posts/{post_id}")
+        return response.status_code
+
+    async def comment(self, rng: random.Random) -> int:
+        response = await self.client.request(
+            "POST",
+            "/comments/",
+            headers={"Authorization": f"Bearer {rng.choice(self.tokens)}"},
+            json_body={"content": "Comentario de benchmark", "post_id": rng.randint(1, self.dataset.posts)}
+        )
+        return response.status_code
+
+    async def login(self, rng: random.Random) -> int:
+        response = await self.client.request(
+            "POST",
+            "/auth/login",
+            form={"username": f"user{rng.randint(1, self.dataset.users)}", "password": BENCH_PASSWORD}
+        )
+        return response.status_code
+
+    async def register(self, rng: random.Random) -> int:
+        self._registered += 1
+        username = f"bench{self.run_id}x{self._registered}"
+        response = await self.client.request(
+            "POST",
+            "/auth/register",
+            json_body={"username": username, "email": f"{username}@example.com", "password": BENCH_PASSWORD}
+        )
+        return response.status_code
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples: Dict[str, RouteSamples], elapsed: float) -> Dict[str, dict]:
+    routes = {}
+    for route, data in sorted(samples.items()):
+        values = sorted(data.latencies)
+        routes[route] = {
+            "requests": len(values),
+            "errors": data.errors,
+            "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+            "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        }
+    return routes
+
+
+async def run_mix(
+    scenarios: Scenarios,
+    mix: Dict[str, int],
+    concurrency: int,
+    total_requests: int,
+    seed: int
+) -> dict:
+    """Ejecuta `total_requests` requests repartidos entre `concurrency` workers."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    handlers: Dict[str, Callable[[random.Random], Awaitable[int]]] = {
+        name: getattr(scenarios, name) for name in names
+    }
+    samples: Dict[str, RouteSamples] = {ROUTES[name]: RouteSamples() for name in names}
+    remaining = total_requests
+
+    async def worker(worker_id: int) -> None:
+        nonlocal remaining
+        rng = random.Random(seed * 1000 + worker_id)
+        while remaining > 0:
+            remaining -= 1
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            status_code = await handlers[name](rng)
+            route_samples = samples[ROUTES[name]]
+            route_samples.latencies.append(time.perf_counter() - start)
+            if status_code >= 400:
+                route_samples.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+        "routes": summarize({route: data for route, data in samples.items() if data.latencies}, elapsed),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Compara dos resultados y devuelve la lista de regresiones.
+
+    Una ruta empeora si su p95 o p99 sube, o su throughput baja, más que
+    `threshold` (fracción, 0.2 = 20%) respecto al baseline.
+    """
+    regressions = []
+    for run_key, run in current["runs"].items():
+        base_run = baseline.get("runs", {}).get(run_key)
+        if base_run is None:
+            continue
+        for route, stats in run["routes"].items():
+            base = base_run["routes"].get(route)
+            if base is None or min(stats["requests"], base["requests"]) < MIN_SAMPLES:
+                continue
+            for metric in ("p95_ms", "p99_ms"):
+                if base[metric] and stats[metric] > base[metric] * (1 + threshold):
+                    regressions.append(
+                        f"{run_key} {route}: {metric} {base[metric]:.2f} -> {stats[metric]:.2f}"
+                    )
+            if base["throughput_rps"] and stats["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+                regressions.append(
+                    f"{run_key} {route}: throughput_rps {base['throughput_rps']:.1f} -> {stats['throughput_rps']:.1f}"
+                )
+    return regressions
+
+
+def print_report(results: dict) -> None:
+    header = f"{'run':<14} {'route':<24} {'req':>6} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for run_key, run in results["runs"].items():
+        for route, stats in run["routes"].items():
+            print(
+                f"{run_key:<14} {route:<24} {stats['requests']:>6} {stats['errors']:>5} "
+                f"{stats['throughput_rps']:>9.1f} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+            )
+        print(f"{run_key:<14} {'total':<24} {run['requests']:>6} {'':>5} {run['throughput_rps']:>9.1f}")
+
+
+def migrate() -> None:
+    """Aplica las migraciones de Alembic a la base de datos configurada."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    command.upgrade(config, "head")
+
+
+async def seed(dataset: Dataset, seed_value: int) -> None:
+    """Siembra la base de datos con el seed determinista de app.commands.seed."""
+    from app.commands.seed import SeedConfig, seed_database
+    from app.database.session import engine
+
+    await seed_database(engine, SeedConfig(
+        users=dataset.users,
+        posts=dataset.posts,
+        comments=dataset.comments,
+        seed=seed_value,
+        password=BENCH_PASSWORD
+    ))
+
+
+async def run_benchmark(args: argparse.Namespace, dataset: Dataset, fresh_database: bool) -> dict:
+    from app.core.security import create_access_token
+    from app.database.session import engine, read_engine
+    from app.main import app
+    from benchmarks.asgi import ASGIClient
+
+    rng = random.Random(args.seed)
+    if fresh_database:
+        await seed(dataset, args.seed)
+
+    tokens = [
+        create_access_token({"sub": str(user_id)})
+        for user_id in rng.sample(range(1, dataset.users + 1), min(dataset.users, 32))
+    ]
+    run_id = f"{int(time.time())}"
+
+    results = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": sqlite3.sqlite_version,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "dataset": vars(dataset),
+        },
+        "runs": {},
+    }
+
+    async with ASGIClient(app) as client:
+        scenarios = Scenarios(client, dataset, tokens, run_id)
+        for mix_name in args.mix:
+            for concurrency in args.concurrency:
+                if args.warmup:
+                    await run_mix(scenarios, MIXES[mix_name], concurrency, args.warmup, args.seed)
+                run = await run_mix(scenarios, MIXES[mix_name], concurrency, args.requests, args.seed)
+                run["mix"] = mix_name
+                results["runs"][f"{mix_name}@c{concurrency}"] = run
+
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    return results
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def _mix_list(value: str) -> List[str]:
+    names = [item for item in value.split(",") if item]
+    unknown = [name for name in names if name not in MIXES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"mezcla desconocida: {', '.join(unknown)} (opciones: {', '.join(MIXES)})")
+    return names
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark HTTP de la API en proceso")
+    parser.add_argument("--mix", type=_mix_list, default=["read", "mixed"], help="Mezclas a ejecutar (read, write, mixed)")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 16], help="Niveles de concurrencia, p. ej. 1,16,64")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests medidos por mezcla y concurrencia")
+    parser.add_argument("--warmup", type=int, default=100, help="Requests de calentamiento no medidos")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos y de la elección de escenarios")
+    parser.add_argument(
+        "--database-url",
+        help="Base de datos ya migrada y sembrada con el mismo tamaño; por defecto se crea una temporal"
+    )
+    parser.add_argument("--output", type=Path, help="Archivo JSON de resultados (por defecto benchmarks/results/)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regresión tolerada (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como nuevo baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    dataset = Dataset(users=args.users, posts=args.posts, comments=args.comments)
+
+    # La configuración se lee al importar app, así que el entorno se prepara antes
+    fresh_database = args.database_url is None
+    if fresh_database:
+        database_path = Path(tempfile.mkdtemp(prefix="benchmark-")) / "benchmark.db"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database_path}"
+    else:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("DB_ECHO", "false")
+    # Todos los requests salen de la misma IP: el rate limit cortaría login y registro
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    if fresh_database:
+        migrate()
+    # Sin una línea de log por request; los avisos de N+1 se siguen mostrando
+    logging.getLogger("app.middleware.logging").setLevel(logging.WARNING)
+
+    results = asyncio.run(run_benchmark(args, dataset, fresh_database))
+    print_report(results)
+
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nResultados guardados en {output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline actualizado en {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No hay baseline en {args.baseline}; usar --save-baseline para crearlo")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    if regressions:
+        print(f"\nRegresiones respecto al baseline (umbral {args.threshold:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nSin regresiones respecto al baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Micro-benchmark de serialización de listados de posts con comentarios,
+autores y tags anidados (la forma de GET /posts/), sin base de datos.
+
+Compara tres caminos:
+  - fastapi: el de FastAPI por defecto (validar, dump_python y json.dumps)
+  - fastapi+orjson: el mismo con FastJSONResponse como clase de respuesta
+  - model_response: validar y serializar directo a bytes con un TypeAdapter
+
+Uso:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --posts 100 --comments 20 --repeat 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app import models  # noqa: F401 (registra todos los mappers)
+from app.core.responses import FastJSONResponse, model_response, orjson
+from app.models import Comment, Post, Tag, User
+from app.schemas import PostResponse
+
+
+def build_posts(posts: int, comments: int, tags: int) -> List[Post]:
+    """Crea posts transitorios (sin sesión) con sus relaciones ya cargadas."""
+    now = datetime(2024, 1, 1)
+    users = [
+        User(
+            id=i, username=f"user{i}", email=f"user{i}@example.com", hashed_password="x",
+            is_active=True, post_count=1, created_at=now, updated_at=now
+        )
+        for i in range(1, 11)
+    ]
+    tag_objects = [
+        Tag(id=i, name=f"tag{i}", post_count=1, created_at=now, updated_at=now)
+        for i in range(1, tags + 1)
+    ]
+    result = []
+    for post_id in range(1, posts + 1):
+        created_at = now + timedelta(minutes=post_id)
+        post = Post(
+            id=post_id,
+            title=f"Post número {post_id}",
+            content="Contenido de ejemplo con algo de texto. " * 10,
+            user_id=users[post_id % 10].id,
+            comment_count=comments,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        post.author = users[post_id % 10]
+        post.tags = list(tag_objects)
+        post.comments = [
+            Comment(
+                id=post_id * 1000 + i,
+                content=f"Comentario {i} del post {post_id}",
+                post_id=post_id,
+                user_id=users[i % 10].id,
+                author=users[i % 10],
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            for i in range(comments)
+        ]
+        result.append(post)
+    return result
+
+
+def timed(func: Callable[[], bytes], repeat: int) -> float:
+    """Mejor tiempo (segundos) de `repeat` ejecuciones."""
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listados de posts")
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--comments", type=int, default=10)
+    parser.add_argument("--tags", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    posts = build_posts(args.posts, args.comments, args.tags)
+    field = create_response_field(name="Response_get_posts", type_=List[PostResponse])
+
+    def fastapi_path(response_class) -> Callable[[], bytes]:
+        def run() -> bytes:
+            content = asyncio.run(serialize_response(field=field, response_content=posts))
+            return response_class(content).body
+        return run
+
+    candidates = {
+        "fastapi": fastapi_path(JSONResponse),
+        "fastapi+orjson": fastapi_path(FastJSONResponse),
+        "model_response": lambda: model_response(List[PostResponse], posts).body,
+    }
+
+    print(f"{args.posts} posts x {args.comments} comentarios, orjson {'sí' if orjson else 'no'}")
+    baseline = None
+    for name, func in candidates.items():
+        seconds = timed(func, args.repeat)
+        baseline = baseline or seconds
+        print(f"{name:<16} {seconds * 1000:8.2f} ms  x{baseline / seconds:.2f}  ({len(func())} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Fixtures comunes de los tests.
+
+Los tests usan la aplicación real (TestClient) sobre una base SQLite
+temporal migrada con alembic. Las variables de entorno se fijan antes de
+importar la aplicación, porque la configuración y los engines se crean al
+importar app.core.config y app.database.session.
+"""
+import itertools
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+TEST_DIR = Path(tempfile.mkdtemp(prefix="blog-tests-"))
+DB_PATH = TEST_DIR / "test.db"
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["DB_ECHO"] = "false"
+# Todos los requests salen de la misma IP del TestClient
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core.response_cache import response_cache  # noqa: E402
+from app.database.instrumentation import QueryStats  # noqa: E402
+from app.database.session import engine, read_engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+PASSWORD = "password123"
+_user_numbers = itertools.count(1)
+
+
+def _migrate() -> None:
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient de la aplicación, con el lifespan (warmup) ya ejecutado."""
+    _migrate()
+    with TestClient(app) as test_client:
+        yield test_client
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def sql():
+    """Conexión sqlite3 directa a la base de los tests, para leer o preparar filas."""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(autouse=True)
+def _clear_response_cache():
+    """Cada test empieza con el cache de respuestas vacío."""
+    response_cache.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """Cuenta las sentencias SQL de un bloque y falla si superan `max_queries`.
+
+    Cuenta en los engines de escritura y de lectura. El bloque devuelve el
+    QueryStats, para comprobar además el número exacto o las repeticiones.
+
+    Uso:
+        with query_budget(2) as stats:
+            client.get("/posts/")
+    """
+    engines = {id(db_engine): db_engine.sync_engine for db_engine in (engine, read_engine)}
+
+    @contextmanager
+    def _budget(max_queries: int):
+        stats = QueryStats()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            stats.record(statement, 0.0)
+
+        for sync_engine in engines.values():
+            event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            yield stats
+        finally:
+            for sync_engine in engines.values():
+                event.remove(sync_engine, "before_cursor_execute", record)
+        assert stats.count <= max_queries, _format_stats(stats, max_queries)
+
+    return _budget
+
+
+def _format_stats(stats: QueryStats, max_queries: int) -> str:
+    lines = [f"{stats.count} sentencias SQL (máximo {max_queries}):"]
+    for statement, count in stats.statements.items():
+        lines.append(f"  {count}x {' '.join(statement.split())[:200]}")
+    return "\n".join(lines)
+
+
+@pytest.fixture(scope="session")
+def make_user(client):
+    """Registra un usuario nuevo y devuelve (id, headers con su token).
+
+    Hace un GET /users/me tras el login para que el principal quede en
+    cache y los requests del test no incluyan el SELECT del usuario.
+    """
+    def _make_user():
+        number = next(_user_numbers)
+        username = f"tester{number}"
+        response = client.post("/auth/register", json={
+            "email": f"{username}@example.com",
+            "username": username,
+            "password": PASSWORD,
+        })
+        assert response.status_code == 201, response.text
+        response = client.post("/auth/login", data={"username": username, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        response = client.get("/users/me", headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json()["id"], headers
+
+    return _make_user
+
+
+@pytest.fixture(scope="session")
+def make_post(client):
+    """Crea un post con el usuario dado y devuelve su JSON."""
+    def _make_post(headers, title="Post de prueba", content="Contenido del post de prueba"):
+        response = client.post("/posts/", json={"title": title, "content": content}, headers=headers)
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return _make_post
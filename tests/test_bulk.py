@@ -0,0 +1,48 @@
+"""Endpoints /bulk: errores por elemento y nombres de tag en conflicto."""
+
+
+def test_items_that_are_not_objects_are_reported_per_index(client, make_user):
+    _, headers = make_user()
+    response = client.post("/posts/bulk", json={"items": [
+        "x",
+        {"title": "Post del lote", "content": "Contenido del post del lote"},
+        1,
+    ]}, headers=headers)
+
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert len(body["created_ids"]) == 1
+    assert [error["index"] for error in body["errors"]] == [0, 2]
+
+
+def test_tag_names_that_already_exist_are_item_errors(client, make_user, sql):
+    _, headers = make_user()
+    assert client.post("/tags/", json={"name": "bulk-existente"}, headers=headers).status_code == 201
+    # El índice único incluye los tags borrados
+    sql.execute("INSERT INTO tags (name, is_deleted, post_count, created_at, updated_at) "
+                "VALUES ('bulk-borrado', 1, 0, '2024-01-01', '2024-01-01')")
+    sql.commit()
+
+    response = client.post("/tags/bulk", json={"items": [
+        {"name": "bulk-nuevo"},
+        {"name": "bulk-existente"},
+        {"name": "bulk-nuevo"},
+        {"name": "bulk-borrado"},
+        {"name": "bulk-otro"},
+    ]}, headers=headers)
+
+    assert response.status_code == 201, response.text
+    body = response.json()
+    names = {row["id"]: row["name"] for row in sql.execute("SELECT id, name FROM tags")}
+    assert [names[tag_id] for tag_id in body["created_ids"]] == ["bulk-nuevo", "bulk-otro"]
+    assert [error["index"] for error in body["errors"]] == [1, 2, 3]
+
+
+def test_tag_bulk_with_only_existing_names_is_rejected(client, make_user):
+    _, headers = make_user()
+    assert client.post("/tags/", json={"name": "bulk-repetido"}, headers=headers).status_code == 201
+
+    response = client.post("/tags/bulk", json={"items": [{"name": "bulk-repetido"}]}, headers=headers)
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["index"] == 0
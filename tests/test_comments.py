@@ -0,0 +1,110 @@
+"""Respuestas concurrentes con el borrado del padre y paginación de hilos."""
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.routers.comments import THREAD_TRUNCATED_HEADER
+
+
+def _comment(client, headers, post_id, parent_id=None):
+    response = client.post(
+        "/comments/", json={"content": "Comentario", "post_id": post_id, "parent_id": parent_id}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _reply_while_parent_is_deleted(client, sql, headers, post_id, parent_id, json=None, path="/comments/"):
+    """Envía una respuesta mientras otra transacción borra el padre y aún no confirmó."""
+    sql.execute("BEGIN IMMEDIATE")
+    sql.execute("UPDATE comments SET is_deleted = 1 WHERE id = ?", (parent_id,))
+    sql.execute("UPDATE posts SET comment_count = comment_count - 1 WHERE id = ?", (post_id,))
+
+    responses = []
+    request = threading.Thread(target=lambda: responses.append(client.post(
+        path, json=json or {"content": "Respuesta", "post_id": post_id, "parent_id": parent_id}, headers=headers
+    )))
+    request.start()
+    # La respuesta espera al lock de escritura (busy_timeout) y luego se confirma el borrado
+    time.sleep(0.3)
+    sql.commit()
+    request.join()
+    return responses[0]
+
+
+def test_reply_to_a_parent_deleted_concurrently_is_rejected(client, sql, make_user, make_post):
+    _, headers = make_user()
+    post = make_post(headers)
+    parent_id = _comment(client, headers, post["id"])
+
+    response = _reply_while_parent_is_deleted(client, sql, headers, post["id"], parent_id)
+
+    assert response.status_code == 404, response.text
+    live = sql.execute(
+        "SELECT count(*) FROM comments WHERE post_id = ? AND is_deleted = 0", (post["id"],)
+    ).fetchone()[0]
+    assert live == 0
+    assert sql.execute("SELECT comment_count FROM posts WHERE id = ?", (post["id"],)).fetchone()[0] == 0
+
+
+def test_bulk_reply_to_a_parent_deleted_concurrently_is_an_item_error(client, sql, make_user, make_post):
+    _, headers = make_user()
+    post = make_post(headers)
+    parent_id = _comment(client, headers, post["id"])
+
+    response = _reply_while_parent_is_deleted(
+        client, sql, headers, post["id"], parent_id, path="/comments/bulk", json={"items": [
+            {"content": "Respuesta", "post_id": post["id"], "parent_id": parent_id},
+            {"content": "Nuevo", "post_id": post["id"]},
+        ]}
+    )
+
+    assert response.status_code == 201, response.text
+    assert [error["index"] for error in response.json()["errors"]] == [0]
+    assert sql.execute("SELECT comment_count FROM posts WHERE id = ?", (post["id"],)).fetchone()[0] == 1
+
+
+@pytest.fixture
+def small_threads(monkeypatch):
+    monkeypatch.setattr(settings, "COMMENT_THREAD_MAX_ITEMS", 3)
+
+
+def test_threads_page_ends_at_the_last_complete_thread(client, make_user, make_post, small_threads):
+    _, headers = make_user()
+    post_id = make_post(headers)["id"]
+    first = _comment(client, headers, post_id)
+    first_replies = [_comment(client, headers, post_id, first) for _ in range(2)]
+    second = _comment(client, headers, post_id)
+    second_reply = _comment(client, headers, post_id, second)
+    third = _comment(client, headers, post_id)
+
+    response = client.get(f"/comments/post/{post_id}/threads")
+    assert [comment["id"] for comment in response.json()] == [first, *first_replies]
+    assert THREAD_TRUNCATED_HEADER not in response.headers
+
+    response = client.get(
+        f"/comments/post/{post_id}/threads", params={"after": response.headers[NEXT_CURSOR_HEADER]}
+    )
+    assert [comment["id"] for comment in response.json()] == [second, second_reply, third]
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_thread_larger_than_the_maximum_is_truncated(client, make_user, make_post, small_threads):
+    _, headers = make_user()
+    post_id = make_post(headers)["id"]
+    big = _comment(client, headers, post_id)
+    for _ in range(4):
+        _comment(client, headers, post_id, big)
+    after = _comment(client, headers, post_id)
+
+    response = client.get(f"/comments/post/{post_id}/threads")
+    assert len(response.json()) == 3
+    assert response.headers[THREAD_TRUNCATED_HEADER] == "true"
+
+    response = client.get(
+        f"/comments/post/{post_id}/threads", params={"after": response.headers[NEXT_CURSOR_HEADER]}
+    )
+    assert [comment["id"] for comment in response.json()] == [after]
@@ -0,0 +1,34 @@
+"""Compresión de respuestas (app.middleware.compression)."""
+import pytest
+
+from app.middleware.compression import available_encodings
+
+
+def test_small_response_is_not_compressed_but_varies(client):
+    response = client.get("/health/ready", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert "accept-encoding" in response.headers["vary"].lower()
+
+
+def test_response_without_accept_encoding_varies(client):
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert "accept-encoding" in response.headers["vary"].lower()
+
+
+def test_large_response_is_compressed(client):
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"].lower().count("accept-encoding") == 1
+
+
+def test_brotli_is_negotiated_when_installed(client):
+    pytest.importorskip("brotli")
+    assert "br" in available_encodings()
+
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.headers["content-encoding"] == "br"
@@ -0,0 +1,75 @@
+"""Contadores desnormalizados (comment_count y post_count)."""
+
+OLD_TIMESTAMP = "2020-01-01 00:00:00.000000"
+
+
+def _set_updated_at(sql, table, row_id):
+    sql.execute(f"UPDATE {table} SET updated_at = ? WHERE id = ?", (OLD_TIMESTAMP, row_id))
+    sql.commit()
+
+
+def _row(sql, table, row_id):
+    return sql.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone()
+
+
+def test_create_post_counts_without_touching_author_updated_at(client, sql, make_user, make_post):
+    user_id, headers = make_user()
+    _set_updated_at(sql, "users", user_id)
+
+    make_post(headers)
+    make_post(headers)
+
+    user = _row(sql, "users", user_id)
+    assert user["post_count"] == 2
+    assert user["updated_at"] == OLD_TIMESTAMP
+
+
+def test_create_comment_counts_without_touching_post_updated_at(client, sql, make_user, make_post):
+    _, headers = make_user()
+    post = make_post(headers)
+    _set_updated_at(sql, "posts", post["id"])
+
+    response = client.post("/comments/", json={"content": "Hola", "post_id": post["id"]}, headers=headers)
+    assert response.status_code == 201, response.text
+    response = client.post(
+        "/comments/bulk",
+        json={"items": [{"content": "Uno", "post_id": post["id"]}, {"content": "Dos", "post_id": post["id"]}]},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    comment_id = response.json()["created_ids"][0]
+    assert client.delete(f"/comments/{comment_id}", headers=headers).status_code == 204
+
+    row = _row(sql, "posts", post["id"])
+    assert row["comment_count"] == 2
+    assert row["updated_at"] == OLD_TIMESTAMP
+
+
+def test_tagging_counts_without_touching_tag_updated_at(client, sql, make_user, make_post):
+    _, headers = make_user()
+    post = make_post(headers)
+    response = client.put(f"/posts/{post['id']}/tags", json={"names": ["contadores"]}, headers=headers)
+    assert response.status_code == 200, response.text
+    tag_id = response.json()[0]["id"]
+    _set_updated_at(sql, "tags", tag_id)
+
+    other = make_post(headers)
+    response = client.put(f"/posts/{other['id']}/tags", json={"names": ["contadores"]}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    tag = _row(sql, "tags", tag_id)
+    assert tag["post_count"] == 2
+    assert tag["updated_at"] == OLD_TIMESTAMP
+
+
+def test_cached_author_gets_post_count_from_the_database(client, sql, make_user, make_post):
+    user_id, headers = make_user()
+    make_post(headers)
+    # Otra escritura concurrente del mismo usuario, que este proceso no vio
+    sql.execute("UPDATE users SET post_count = post_count + 1 WHERE id = ?", (user_id,))
+    sql.commit()
+
+    make_post(headers)
+
+    assert _row(sql, "users", user_id)["post_count"] == 3
+    assert client.get("/users/me", headers=headers).json()["post_count"] == 3
@@ -0,0 +1,109 @@
+"""
+Presupuesto de sentencias SQL por endpoint.
+
+Los datos tienen varios posts, autores, comentarios, respuestas y tags, así
+que un N+1 en los options(...) de carga haría crecer el número de
+sentencias por encima del presupuesto, que no depende del tamaño de la
+página.
+"""
+import pytest
+
+from app.routers import posts as posts_router
+
+POSTS = 6
+COMMENTS_PER_POST = 3
+
+
+@pytest.fixture(scope="module")
+def blog(client, make_user, make_post):
+    """Posts con tags, comentarios de varios autores y un hilo de respuestas."""
+    _, author_headers = make_user()
+    commenters = [make_user()[1] for _ in range(COMMENTS_PER_POST)]
+    post_ids = []
+    for number in range(POSTS):
+        post = make_post(author_headers, title=f"Presupuesto {number}")
+        post_ids.append(post["id"])
+        response = client.put(
+            f"/posts/{post['id']}/tags", json={"names": ["budget", f"budget-{number % 2}"]},
+            headers=author_headers
+        )
+        assert response.status_code == 200, response.text
+        for headers in commenters:
+            response = client.post(
+                "/comments/", json={"content": "Comentario", "post_id": post["id"]}, headers=headers
+            )
+            assert response.status_code == 201, response.text
+
+    # Hilo: comentario raíz con respuestas anidadas de varios autores
+    thread_post = post_ids[0]
+    response = client.post("/comments/", json={"content": "Raíz", "post_id": thread_post}, headers=author_headers)
+    root_id = parent_id = response.json()["id"]
+    for headers in commenters * 2:
+        response = client.post(
+            "/comments/", json={"content": "Respuesta", "post_id": thread_post, "parent_id": parent_id},
+            headers=headers
+        )
+        assert response.status_code == 201, response.text
+        parent_id = response.json()["id"]
+    return {"post_ids": post_ids, "thread_post": thread_post, "root_id": root_id}
+
+
+@pytest.mark.parametrize("path, max_queries", [
+    # posts + autores + comentarios + autores de comentarios + tags
+    ("/posts/?limit=50", 5),
+    ("/posts/?limit=50&tag=budget&tag=budget-1&match=all", 5),
+    # una consulta con el username y subconsulta correlacionada de tags
+    ("/posts/summary?limit=50", 1),
+    ("/posts/summary?limit=50&tag=budget", 1),
+    ("/users/?limit=50", 1),
+    ("/tags/", 1),
+])
+def test_list_endpoints(client, blog, query_budget, path, max_queries):
+    with query_budget(max_queries):
+        response = client.get(path)
+    assert response.status_code == 200, response.text
+    assert len(response.json()) > 1
+
+
+def test_post_detail(client, blog, query_budget):
+    post_id = blog["post_ids"][1]
+    # post, autor, comentarios, autores de comentarios, tags
+    with query_budget(5):
+        response = client.get(f"/posts/{post_id}")
+    assert response.status_code == 200, response.text
+    assert len(response.json()["comments"]) == COMMENTS_PER_POST
+
+    # La segunda vez sale del cache de respuestas
+    with query_budget(0):
+        assert client.get(f"/posts/{post_id}").status_code == 200
+
+
+def test_comments_by_post(client, blog, query_budget):
+    # existencia del post + comentarios con su autor
+    with query_budget(3):
+        response = client.get(f"/comments/post/{blog['post_ids'][1]}")
+    assert response.status_code == 200, response.text
+
+
+def test_threads(client, blog, query_budget):
+    # existencia del post + raíces de la página + rango de rutas con autores
+    with query_budget(3):
+        response = client.get(f"/comments/post/{blog['thread_post']}/threads?limit=20")
+    assert response.status_code == 200, response.text
+    assert len(response.json()) > COMMENTS_PER_POST
+
+    # raíz del subárbol + rango de rutas con autores
+    with query_budget(2):
+        response = client.get(f"/comments/{blog['root_id']}/thread")
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == 1 + 2 * COMMENTS_PER_POST
+
+
+def test_export_queries_per_chunk(client, blog, query_budget, monkeypatch):
+    # Bloques de 2 posts: el cursor y, por bloque, comentarios y tags
+    monkeypatch.setattr(posts_router, "EXPORT_CHUNK_SIZE", 2)
+    with query_budget(1 + 2 * (POSTS // 2)) as stats:
+        response = client.get("/posts/export?tag=budget")
+    assert response.status_code == 200, response.text
+    assert len(response.text.splitlines()) == POSTS
+    assert not stats.repeated(POSTS)
@@ -0,0 +1,83 @@
+"""
+Planes de ejecución (EXPLAIN QUERY PLAN) de las consultas de los routers.
+
+Falla si alguna consulta recorre una tabla completa sin índice. Las
+consultas se construyen con las mismas funciones que usan los routers
+(app.commands.check_query_plans.query_shapes), y además se revisan las
+sentencias que emiten de verdad los endpoints de lectura, incluidas las
+de los selectinload que genera el ORM.
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import sqlite
+
+from app.commands.check_query_plans import explain_sql, full_scans, query_shapes
+from app.database.session import engine, read_engine
+
+SHAPES = query_shapes()
+
+
+def _plan(sql_conn, statement, params=()):
+    return [row[3] for row in sql_conn.execute(statement, params)]
+
+
+@pytest.mark.parametrize("stmt", [stmt for _, stmt in SHAPES], ids=[name for name, _ in SHAPES])
+def test_router_query_uses_indexes(client, sql, stmt):
+    statement, params = explain_sql(stmt, sqlite.dialect())
+    plan = _plan(sql, statement, params)
+    assert not full_scans(plan), plan
+
+
+@pytest.fixture
+def blog_with_threads(client, make_user, make_post):
+    user_id, headers = make_user()
+    post = make_post(headers)
+    client.put(f"/posts/{post['id']}/tags", json={"names": ["planes"]}, headers=headers)
+    root = client.post("/comments/", json={"content": "Raíz", "post_id": post["id"]}, headers=headers).json()
+    client.post(
+        "/comments/", json={"content": "Respuesta", "post_id": post["id"], "parent_id": root["id"]},
+        headers=headers
+    )
+    return {"user_id": user_id, "post_id": post["id"], "comment_id": root["id"]}
+
+
+def test_endpoint_statements_use_indexes(client, sql, blog_with_threads):
+    post_id, comment_id = blog_with_threads["post_id"], blog_with_threads["comment_id"]
+    paths = [
+        "/posts/?limit=5",
+        "/posts/?limit=5&tag=planes",
+        "/posts/summary?limit=5&tag=planes",
+        "/posts/search?q=prueba",
+        "/posts/export?tag=planes",
+        f"/posts/{post_id}",
+        f"/users/{blog_with_threads['user_id']}",
+        f"/comments/post/{post_id}",
+        f"/comments/post/{post_id}/threads",
+        f"/comments/{comment_id}/thread",
+        "/tags/?limit=5",
+        "/tags/name/planes",
+    ]
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            executed.append((statement, parameters))
+
+    sync_engines = {id(db_engine): db_engine.sync_engine for db_engine in (engine, read_engine)}
+    for sync_engine in sync_engines.values():
+        event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        for path in paths:
+            response = client.get(path)
+            assert response.status_code == 200, (path, response.text)
+    finally:
+        for sync_engine in sync_engines.values():
+            event.remove(sync_engine, "before_cursor_execute", record)
+
+    assert executed
+    failures = []
+    for statement, parameters in executed:
+        scans = full_scans(_plan(sql, f"EXPLAIN QUERY PLAN {statement}", parameters))
+        if scans:
+            failures.append(f"{scans}: {' '.join(statement.split())[:200]}")
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,56 @@
+"""Rate limit de login por IP y por username (app.core.rate_limit)."""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.rate_limit import (
+    MemoryRateLimitStore,
+    RateLimiter,
+    RateLimitPolicy,
+    SQLiteRateLimitStore,
+)
+
+POLICY = RateLimitPolicy(name="login", capacity=2, period=3600)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def limiter(request, tmp_path):
+    if request.param == "memory":
+        store = MemoryRateLimitStore(shards=4, max_keys=100)
+    else:
+        store = SQLiteRateLimitStore(str(tmp_path / "rate_limits.db"))
+    rate_limiter = RateLimiter(store)
+    yield rate_limiter
+    rate_limiter.close()
+
+
+def _login(limiter: RateLimiter, ip: str, username: str) -> bool:
+    try:
+        asyncio.run(limiter.check(POLICY, f"ip:{ip}", f"username:{username}"))
+    except HTTPException as exc:
+        assert exc.status_code == 429
+        return False
+    return True
+
+
+def test_blocked_username_does_not_spend_ip_tokens(limiter):
+    assert _login(limiter, "10.0.0.1", "victim")
+    assert _login(limiter, "10.0.0.2", "victim")
+
+    # Cada intento contra el username bloqueado devuelve el token de la IP
+    for _ in range(5):
+        assert not _login(limiter, "10.0.0.3", "victim")
+    assert _login(limiter, "10.0.0.3", "alice")
+    assert _login(limiter, "10.0.0.3", "bob")
+    assert not _login(limiter, "10.0.0.3", "carol")
+
+
+def test_blocked_ip_does_not_spend_username_tokens(limiter):
+    assert _login(limiter, "10.0.0.1", "alice")
+    assert _login(limiter, "10.0.0.1", "bob")
+
+    assert not _login(limiter, "10.0.0.1", "carol")
+    assert _login(limiter, "10.0.0.2", "carol")
+    assert _login(limiter, "10.0.0.3", "carol")
+    assert limiter.stats()["rejected"] == 1
@@ -0,0 +1,66 @@
+"""Cache de respuestas con ETag (app.core.response_cache)."""
+import asyncio
+
+from starlette.requests import Request
+
+from app.core import response_cache as response_cache_module
+from app.core.response_cache import ResponseCache, cached_json_response
+
+
+def test_set_skips_body_built_before_an_invalidation():
+    cache = ResponseCache(max_size=10, ttl=60)
+    generation = cache.generation()
+    # Una escritura confirma e invalida mientras se construía la respuesta
+    cache.invalidate("post:1")
+    cache.set("detail", b"{}", ["post:1", "user:1"], generation=generation)
+
+    assert cache.get("detail") is None
+    assert cache.stats()["stale_skips"] == 1
+
+
+def test_set_keeps_body_when_other_dependencies_change():
+    cache = ResponseCache(max_size=10, ttl=60)
+    cache.invalidate("post:1")
+    generation = cache.generation()
+    cache.invalidate("post:2")
+    cache.set("detail", b"{}", ["post:1"], generation=generation)
+
+    assert cache.get("detail") is not None
+
+
+def test_forgotten_invalidations_are_treated_as_stale():
+    cache = ResponseCache(max_size=1, ttl=60)
+    generation = cache.generation()
+    cache.invalidate("post:1")
+    cache.invalidate("post:2")  # desplaza a post:1 del registro de invalidaciones
+    cache.set("detail", b"{}", ["post:1"], generation=generation)
+    assert cache.get("detail") is None
+
+    cache.set("detail", b"{}", ["post:1"], generation=cache.generation())
+    assert cache.get("detail") is not None
+
+
+def test_clear_discards_bodies_being_built():
+    cache = ResponseCache(max_size=10, ttl=60)
+    generation = cache.generation()
+    cache.clear()
+    cache.set("detail", b"{}", ["post:1"], generation=generation)
+
+    assert cache.get("detail") is None
+
+
+def test_cached_json_response_does_not_store_body_invalidated_during_build(monkeypatch):
+    cache = ResponseCache(max_size=10, ttl=60)
+    monkeypatch.setattr(response_cache_module, "response_cache", cache)
+    request = Request({"type": "http", "method": "GET", "path": "/posts/1", "headers": []})
+
+    async def build_racing_with_write():
+        body = b'{"title": "antes"}'
+        cache.invalidate("post:1")
+        return body, {"post:1"}, {}
+
+    response = asyncio.run(cached_json_response(request, ("post", 1), build_racing_with_write))
+
+    assert response.body == b'{"title": "antes"}'
+    assert response.headers["x-cache"] == "MISS"
+    assert cache.get(("post", 1)) is None
@@ -0,0 +1,10 @@
+"""Respuesta JSON por defecto (app.core.responses)."""
+from app.core import responses
+from app.main import app
+
+
+def test_default_response_class_serializes_with_orjson():
+    # orjson está en requirements.txt: el fallback a json es solo para entornos sin él
+    assert responses.orjson is not None
+    assert app.router.default_response_class is responses.FastJSONResponse
+    assert responses.FastJSONResponse({"a": 1}).body == responses.orjson.dumps({"a": 1})
@@ -0,0 +1,60 @@
+"""Búsqueda de posts (GET /posts/search) con FTS5 y con LIKE."""
+import pytest
+
+from app.routers import posts
+
+
+@pytest.fixture
+def like_search(monkeypatch):
+    """Fuerza la búsqueda con LIKE, como sin la migración de FTS5."""
+    async def no_fts(db):
+        return False
+
+    monkeypatch.setattr(posts, "_has_fts_index", no_fts)
+
+
+def _search(client, q):
+    response = client.get("/posts/search", params={"q": q})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_fts_snippet_escapes_post_content(client, make_user, make_post):
+    _, headers = make_user()
+    make_post(headers, content="hola <script>zorblax()</script> & adiós")
+
+    [result] = _search(client, "zorblax")
+
+    assert "<script>" not in result["snippet"]
+    assert "&lt;script&gt;<mark>zorblax</mark>()&lt;/script&gt; &amp; adiós" in result["snippet"]
+
+
+def test_like_snippet_escapes_post_content(client, make_user, make_post, like_search):
+    _, headers = make_user()
+    make_post(headers, content="hola <b>quuxfoo</b> adiós")
+
+    [result] = _search(client, "quuxfoo")
+
+    assert "<b>" not in result["snippet"]
+    assert "&lt;b&gt;quuxfoo&lt;/b&gt;" in result["snippet"]
+
+
+def test_like_search_treats_wildcards_literally(client, make_user, make_post, like_search):
+    _, headers = make_user()
+    literal = make_post(headers, content="descuento del 50%_off_plik en todo")
+    make_post(headers, content="descuento del 50 por ciento off plik")
+
+    assert [result["id"] for result in _search(client, "50%_off_plik")] == [literal["id"]]
+    assert all("%" in result["snippet"] for result in _search(client, "%"))
+
+
+def test_fts_index_is_rechecked_until_it_exists(client, make_user, make_post, monkeypatch):
+    _, headers = make_user()
+    make_post(headers, content="contenido con la palabra wibbleton")
+    # Como si el primer request hubiera llegado antes de la migración
+    monkeypatch.setattr(posts, "_fts_available", False)
+
+    [result] = _search(client, "wibbleton")
+
+    assert result["rank"] is not None
+    assert posts._fts_available
@@ -0,0 +1,57 @@
+"""Seed determinista (app.commands.seed)."""
+import asyncio
+import sqlite3
+
+from app.commands.seed import SeedConfig, seed_database
+from app.database.base import Base
+from app.database.session import build_engine
+from app.models import Post
+
+from conftest import TEST_DIR
+
+CONFIG = SeedConfig(users=30, posts=120, comments=600, tags=12, chunk_size=50)
+
+
+async def _seed(path) -> None:
+    db_engine = build_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await seed_database(db_engine, CONFIG)
+    finally:
+        await db_engine.dispose()
+
+
+def _dump(path) -> str:
+    conn = sqlite3.connect(path)
+    try:
+        return "\n".join(conn.iterdump())
+    finally:
+        conn.close()
+
+
+def test_seed_is_deterministic():
+    first, second = TEST_DIR / "seed-1.db", TEST_DIR / "seed-2.db"
+    asyncio.run(_seed(first))
+    asyncio.run(_seed(second))
+
+    assert _dump(first) == _dump(second)
+
+
+def test_seed_counters_keep_generated_timestamps():
+    path = TEST_DIR / "seed-3.db"
+    asyncio.run(_seed(path))
+
+    conn = sqlite3.connect(path)
+    try:
+        touched = conn.execute(
+            f"SELECT count(*) FROM {Post.__tablename__} "
+            "WHERE comment_count > 0 AND updated_at != created_at"
+        ).fetchone()[0]
+        tags_touched = conn.execute(
+            "SELECT count(*) FROM tags WHERE post_count > 0 AND updated_at != created_at"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    assert touched == 0
+    assert tags_touched == 0
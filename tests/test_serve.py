@@ -0,0 +1,75 @@
+"""Drenado al recibir SIGTERM (app.commands.serve)."""
+import signal
+import time
+
+import pytest
+import uvicorn
+
+from app.commands import serve
+from app.core.config import settings
+from app.core.lifespan import readiness
+
+
+@pytest.fixture
+def restore_readiness():
+    yield
+    readiness.ready = True
+    readiness.draining = False
+
+
+def test_sigterm_reports_not_ready_while_still_serving(client, monkeypatch, restore_readiness):
+    monkeypatch.setattr(settings, "SHUTDOWN_DRAIN_DELAY_SECONDS", 0.2)
+    server = serve.DrainingServer(uvicorn.Config("app.main:app"))
+    assert client.get("/health/ready").status_code == 200
+
+    server.handle_exit(signal.SIGTERM, None)
+
+    # El servidor sigue aceptando, pero el balanceador ya ve 503
+    assert not server.should_exit
+    assert client.get("/health/ready").status_code == 503
+    deadline = time.monotonic() + 5
+    while not server.should_exit and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert server.should_exit
+
+
+def test_second_signal_stops_without_waiting(monkeypatch, restore_readiness):
+    monkeypatch.setattr(settings, "SHUTDOWN_DRAIN_DELAY_SECONDS", 60)
+    server = serve.DrainingServer(uvicorn.Config("app.main:app"))
+
+    server.handle_exit(signal.SIGTERM, None)
+    assert not server.should_exit
+    server.handle_exit(signal.SIGTERM, None)
+    assert server.should_exit
+
+
+def test_sigint_stops_without_waiting(monkeypatch, restore_readiness):
+    monkeypatch.setattr(settings, "SHUTDOWN_DRAIN_DELAY_SECONDS", 60)
+    server = serve.DrainingServer(uvicorn.Config("app.main:app"))
+
+    server.handle_exit(signal.SIGINT, None)
+
+    assert server.should_exit
+    assert readiness.draining
+
+
+def test_multiple_workers_disable_process_local_caches(monkeypatch):
+    for name in serve.PROCESS_LOCAL_CACHES:
+        monkeypatch.setattr(settings, name, 100)
+        monkeypatch.setenv(name, "100")
+
+    serve.disable_process_local_caches()
+
+    for name in serve.PROCESS_LOCAL_CACHES:
+        assert getattr(settings, name) == 0
+        # Los workers del supervisor de uvicorn leen la configuración del entorno
+        assert getattr(type(settings)(), name) == 0
+
+
+def test_respawn_delay_grows_with_consecutive_crashes_up_to_a_cap():
+    delays = [serve.respawn_delay(crashes) for crashes in range(1, 12)]
+
+    assert delays[0] == serve.RESPAWN_DELAY
+    assert delays == sorted(delays)
+    assert delays[1] == 2 * delays[0]
+    assert delays[-1] == serve.RESPAWN_MAX_DELAY
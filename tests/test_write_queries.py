@@ -0,0 +1,67 @@
+"""
+Sentencias SQL de las escrituras de posts y comentarios.
+
+Fija el número exacto de sentencias de cada escritura: la respuesta se arma
+con lo que ya está en la sesión (el usuario actual como autor), sin
+commit/refresh/SELECT adicionales. El principal del usuario ya está en
+cache (make_user), así que get_current_user no consulta la base.
+"""
+
+
+def test_create_post(client, make_user, query_budget):
+    _, headers = make_user()
+    # INSERT del post + UPDATE de users.post_count
+    with query_budget(2) as stats:
+        response = client.post("/posts/", json={"title": "Post nuevo", "content": "Contenido del post"}, headers=headers)
+    assert response.status_code == 201, response.text
+    assert stats.count == 2
+    assert response.json()["author"]["id"] == response.json()["user_id"]
+
+
+def test_update_post(client, make_user, make_post, query_budget):
+    user_id, headers = make_user()
+    post = make_post(headers)
+    client.post("/comments/", json={"content": "Comentario", "post_id": post["id"]}, headers=headers)
+    # UPDATE ... RETURNING + comentarios + autores de los comentarios + tags
+    with query_budget(4) as stats:
+        response = client.put(f"/posts/{post['id']}", json={"title": "Título editado"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert stats.count == 4
+    body = response.json()
+    assert body["title"] == "Título editado"
+    assert body["author"]["id"] == user_id
+    assert body["comments"][0]["author"]["id"] == user_id
+
+
+def test_create_comment(client, make_user, make_post, query_budget):
+    user_id, headers = make_user()
+    post = make_post(headers)
+    # UPDATE de posts.comment_count ... RETURNING + INSERT + UPDATE de la ruta
+    with query_budget(3) as stats:
+        response = client.post("/comments/", json={"content": "Hola", "post_id": post["id"]}, headers=headers)
+    assert response.status_code == 201, response.text
+    assert stats.count == 3
+    root = response.json()
+    assert root["author"]["id"] == user_id
+
+    # Respuesta: además, el SELECT del comentario padre
+    with query_budget(4) as stats:
+        response = client.post(
+            "/comments/", json={"content": "Respuesta", "post_id": post["id"], "parent_id": root["id"]},
+            headers=headers
+        )
+    assert response.status_code == 201, response.text
+    assert stats.count == 4
+    assert response.json()["depth"] == 1
+
+
+def test_update_comment(client, make_user, make_post, query_budget):
+    _, headers = make_user()
+    post = make_post(headers)
+    comment = client.post("/comments/", json={"content": "Hola", "post_id": post["id"]}, headers=headers).json()
+    # Un único UPDATE ... RETURNING
+    with query_budget(1) as stats:
+        response = client.put(f"/comments/{comment['id']}", json={"content": "Editado"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert stats.count == 1
+    assert response.json()["content"] == "Editado"